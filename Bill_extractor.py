@@ -2,11 +2,15 @@ import urllib3
 import ssl
 import requests
 import time
+import threading
 import json
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
 import hashlib
+import base64
+import io
+import zipfile
 from functools import wraps
 from config import *
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -14,6 +18,26 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 ssl._create_default_https_context = ssl._create_unverified_context
 
+RATE_LIMIT_MARKERS = ('rate limit', 'quota', 'too many requests')
+
+class RateLimitError(Exception):
+    """LegiScan rejected a request for exceeding its rate limit or query quota"""
+
+class RateLimiter:
+    """Thread-safe minimum interval between requests, shared by every worker thread"""
+    def __init__(self, min_interval=REQUEST_DELAY):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+    
+    def acquire(self):
+        """Block until this caller's request slot comes up"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        time.sleep(max(0, slot - now))
+
 def retry_on_failure(max_retries=MAX_RETRIES, delay=RETRY_DELAY):
     """Decorator for retrying failed API requests"""
     def decorator(func):
@@ -26,7 +50,9 @@ def retry_on_failure(max_retries=MAX_RETRIES, delay=RETRY_DELAY):
                     if attempt == max_retries - 1:
                         logging.error(f"API request failed after {max_retries} attempts: {e}")
                         raise
-                    wait_time = delay * (2 ** attempt)  # Exponential backoff
+                    # Exponential backoff, starting higher when the API says we're going too fast
+                    base_delay = RATE_LIMIT_DELAY if isinstance(e, RateLimitError) else delay
+                    wait_time = min(base_delay * (2 ** attempt), MAX_RETRY_DELAY)
                     logging.warning(f"Attempt {attempt + 1} failed, retrying in {wait_time}s: {e}")
                     time.sleep(wait_time)
             return None
@@ -86,6 +112,8 @@ class LegiScanAPI:
         self.request_count = 0
         self.failed_requests = 0
         self.bill_details_cache = {}
+        self.bill_change_hashes = {}  # bill_id -> change_hash from the latest search results
+        self.rate_limiter = RateLimiter()
     def get_bill_details(self, bill_id):
         """Get detailed bill information with global caching"""
         if not bill_id:
@@ -96,12 +124,24 @@ class LegiScanAPI:
         if bill_id in self.bill_details_cache:
             return self.bill_details_cache[bill_id]
         
+        # Then the disk cache - keyed on change_hash, so an entry is valid until the bill changes
+        change_hash = self.bill_change_hashes.get(bill_id)
+        disk_key = f"bill_{bill_id}_{change_hash}" if change_hash and self.cache and USE_CACHING else None
+        if disk_key:
+            result = self.cache.load_from_cache(disk_key)
+            if result:
+                self.bill_details_cache[bill_id] = result
+                return result
+        
         # Get from API if not cached
         params = {'id': bill_id}
         result = self._make_request('getBill', params)
         
-        # Cache the result
-        self.bill_details_cache[bill_id] = result
+        # Cache the result - failed fetches are not cached, so a later call retries them
+        if result and result.get('status') == 'OK':
+            self.bill_details_cache[bill_id] = result
+            if disk_key:
+                self.cache.save_to_cache(disk_key, result)
         return result
         
     @retry_on_failure()
@@ -113,16 +153,24 @@ class LegiScanAPI:
         params['key'] = self.api_key
         params['op'] = operation
         
+        # Space requests out across all threads to respect rate limits
+        self.rate_limiter.acquire()
+        
         try:
             response = self.session.get(self.base_url, params=params)
-            response.raise_for_status()
-            
             self.request_count += 1
             
-            # Add delay to respect rate limits
-            time.sleep(REQUEST_DELAY)
+            if response.status_code == 429:
+                self.failed_requests += 1
+                raise RateLimitError(f"HTTP 429 for {operation}")
+            response.raise_for_status()
+            
+            data = response.json()
+            if data.get('status') == 'ERROR' and any(marker in str(data.get('alert', '')).lower() for marker in RATE_LIMIT_MARKERS):
+                self.failed_requests += 1
+                raise RateLimitError(f"{operation}: {data.get('alert')}")
             
-            return response.json()
+            return data
             
         except requests.RequestException as e:
             self.failed_requests += 1
@@ -172,16 +220,57 @@ class LegiScanAPI:
         
         return results
     
-    def get_bill_details(self, bill_id):
-        """Get detailed bill information"""
-        if not bill_id:
-            logging.warning("Empty bill_id provided to get_bill_details")
-            return None
-            
-        params = {'id': bill_id}
-        return self._make_request('getBill', params)
+    def fetch_session_dataset(self, dataset):
+        """Download one session dataset (a getDatasetList entry) and index its bills by bill_id.
+        
+        The zip is kept in the cache directory under its dataset_hash, so an unchanged
+        session is not downloaded again on the next run.
+        """
+        zip_path = None
+        if self.cache:
+            zip_path = self.cache.cache_dir / f"dataset_{dataset['session_id']}_{dataset['dataset_hash']}.zip"
+        
+        if zip_path and zip_path.exists():
+            zip_bytes = zip_path.read_bytes()
+        else:
+            result = self._make_request('getDataset', {'id': dataset['session_id'], 'access_key': dataset['access_key']})
+            if not result or result.get('status') != 'OK':
+                logging.warning(f"Dataset download failed for session {dataset['session_id']}")
+                return 0
+            zip_bytes = base64.b64decode(result['dataset']['zip'])
+            if zip_path:
+                zip_path.write_bytes(zip_bytes)
+        
+        bills_loaded = 0
+        with zipfile.ZipFile(io.BytesIO(zip_bytes)) as archive:
+            for name in archive.namelist():
+                if '/bill/' not in name or not name.endswith('.json'):
+                    continue
+                bill = json.loads(archive.read(name)).get('bill')
+                if bill and bill.get('bill_id'):
+                    # Same shape as a getBill response, so get_bill_details serves it from memory
+                    self.bill_details_cache[bill['bill_id']] = {'status': 'OK', 'bill': bill}
+                    bills_loaded += 1
+        
+        return bills_loaded
     
-   
+    def preload_datasets(self, years):
+        """Preload every state's session datasets for the given years into the bill details cache"""
+        total_bills = 0
+        for year in years:
+            result = self._make_request('getDatasetList', {'year': year})
+            if not result or result.get('status') != 'OK':
+                logging.warning(f"No dataset list for {year}")
+                continue
+            
+            for dataset in result.get('datasetlist', []):
+                try:
+                    total_bills += self.fetch_session_dataset(dataset)
+                except Exception as e:
+                    logging.error(f"Failed to load dataset for session {dataset.get('session_id')}: {e}")
+        
+        logging.info(f"Preloaded {total_bills} bills from session datasets")
+        return total_bills
     
     def get_sessions_by_year(self, year):
         """Get all sessions for a specific year"""
@@ -271,6 +360,12 @@ class LegiScanAPI:
         
         return filtered
 
+    def _remember_change_hashes(self, bills):
+        """Record each search hit's change_hash so get_bill_details can reuse unchanged bills from disk"""
+        for bill in bills:
+            if bill.get('bill_id') and bill.get('change_hash'):
+                self.bill_change_hashes[bill['bill_id']] = bill['change_hash']
+    
     def search_bills_comprehensive(self, query):
         """Comprehensive search using temporal segmentation"""
         logging.info(f"Starting comprehensive temporal search for: {query}")
@@ -282,10 +377,12 @@ class LegiScanAPI:
                 cached_data = self.cache.load_from_cache(cache_key)
                 if cached_data:
                     logging.info(f"Using cached temporal results for: {query}")
+                    self._remember_change_hashes(cached_data)
                     return cached_data
         
         # Perform temporal segmentation search
         all_bills = self.search_temporal_segments(query)
+        self._remember_change_hashes(all_bills)
         
         # Cache results
         if self.cache and USE_CACHING:
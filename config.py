@@ -38,16 +38,19 @@ OUTPUT_FILE = "data/bills_output.xlsx"
 LOG_FILE = "logs/extraction.log"
 
 # Production Performance Settings
-REQUEST_DELAY = 0.25  # Reduced from 0.5 seconds
+REQUEST_DELAY = 0.1  # Minimum spacing between LegiScan requests, shared across all worker threads
 MAX_RESULTS_PER_KEYWORD = None  # Limit results per keyword for faster processing
 CONCURRENT_WORKERS = 3  # Number of parallel workers
 BATCH_SIZE = 20  # Process bills in batches
 USE_CACHING = True  # Enable caching for faster subsequent runs
 CACHE_DURATION_HOURS = 12  # Cache validity period
+USE_DATASETS = False  # Preload whole sessions via getDataset (one call per state session) instead of per-bill getBill
 
 # Retry Configuration
 MAX_RETRIES = 3
 RETRY_DELAY = 1  # Initial retry delay in seconds
+RATE_LIMIT_DELAY = 5  # Initial back-off after a LegiScan rate-limit response
+MAX_RETRY_DELAY = 30  # Cap on any single back-off
 
 # Logging Configuration
 LOG_LEVEL = "INFO"
@@ -1,9 +1,42 @@
-import pandas as pd
 import logging
+import re
+import threading
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
 from config import *
 
+
+def _keyword_variations(keyword):
+    """Lowercased spellings of a keyword accepted by check_keyword_match"""
+    keyword = keyword.lower()
+    return [
+        keyword,
+        keyword.replace(' review', ''),  # "utilization" matches "utilization review"
+        keyword.replace(' ', ''),        # Handle spacing issues
+    ]
+
+_KEYWORD_VARIATIONS = {kw: _keyword_variations(kw) for kw in KEYWORDS}
+
+# Every matched spelling maps to all keywords it implies - a hit on "prompt payment" is also a hit on "prompt pay"
+_VARIATION_KEYWORDS = {
+    spelling: {kw for kw, variations in _KEYWORD_VARIATIONS.items() if any(v in spelling for v in variations)}
+    for variations in _KEYWORD_VARIATIONS.values() for spelling in variations
+}
+
+# One alternation over every spelling, longest first; the lookahead lets overlapping hits all be reported
+KEYWORD_RE = re.compile(
+    '(?=(' + '|'.join(re.escape(v) for v in sorted(_VARIATION_KEYWORDS, key=len, reverse=True)) + '))'
+)
+
+def dedup_by(items, key):
+    """Return items with duplicate keys dropped, keeping the first seen in order"""
+    first_seen = {}
+    for item in items:
+        first_seen.setdefault(key(item), item)
+    return list(first_seen.values())
+
 class BillProcessor:
     def __init__(self):
         self.processed_bills = []
@@ -13,6 +46,9 @@ class BillProcessor:
             'failed': 0,
             'duplicates_removed': 0
         }
+        self._lock = threading.Lock()  # Keywords are processed concurrently by main()
+        self._seen_bills = set()  # (State, Bill Number) of every bill added, so duplicates are dropped on insert
+        self._bill_cache = {}  # bill_id -> Future of year-filtered bill details (None if out of range), shared across keywords
         
     def extract_sponsors(self, sponsors_data, api_handler):
         """Extract sponsors using actual LegiScan data structure"""
@@ -94,12 +130,14 @@ class BillProcessor:
                 'Extracted Date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             }
             
-            self.processing_stats['successful'] += 1
+            with self._lock:
+                self.processing_stats['successful'] += 1
             return processed_bill
             
         except Exception as e:
             logging.error(f"Failed to process bill data: {e}")
-            self.processing_stats['failed'] += 1
+            with self._lock:
+                self.processing_stats['failed'] += 1
             return None
 
     
@@ -128,12 +166,20 @@ class BillProcessor:
     
     def _process_single_bill(self, bill_id, api_handler):
         """Process a single bill (simplified - trust API search results)"""
+        return self._fetch_target_bill(bill_id, api_handler)[0]
+    
+    def _fetch_target_bill(self, bill_id, api_handler):
+        """Fetch a bill, returning (bill_details or None, settled).
+        
+        settled is False when the fetch itself failed, so the None is not a real answer
+        and must not be remembered for the rest of the run.
+        """
         try:
             bill_details = api_handler.get_bill_details(bill_id)
             
             if not bill_details or bill_details.get('status') != 'OK':
                 #print(f"    DEBUG: Bill {bill_id} - Failed to get details")
-                return None
+                return None, False
             
             # Check if bill is from target years
             bill_year = bill_details.get('bill', {}).get('session', {}).get('year_start')
@@ -141,22 +187,19 @@ class BillProcessor:
             
             if bill_year not in TARGET_YEARS:
                 #print(f"    DEBUG: Filtered out {bill_id} - wrong year ({bill_year})")
-                return None
+                return None, True
             
             # Skip keyword verification here - trust API search results
             #print(f"    DEBUG: Bill {bill_id} - Processing (trusting API search)")
-            return bill_details
+            return bill_details, True
             
         except Exception as e:
             logging.error(f"Failed to process bill {bill_id}: {e}")
             #print(f"    DEBUG: Bill {bill_id} - Error: {e}")
-            return None
+            return None, False
 
-    def check_keyword_match(self, bill_data, target_keyword):
-        """Enhanced keyword matching with flexibility"""
-        if not bill_data:
-            return False, target_keyword
-        
+    def _combined_search_text(self, bill_data):
+        """Lowercased title/description/summary/text/history/sponsor text used for keyword matching"""
         # Get the bill data
         bill = bill_data.get('bill', {}) if 'bill' in bill_data else bill_data
         
@@ -182,21 +225,36 @@ class BillProcessor:
                 if isinstance(sponsor, dict):
                     search_fields.append(sponsor.get('name', ''))
         
-        # Combine all text and search (case-insensitive)
-        combined_text = ' '.join(search_fields).lower()
+        # Combine all text (case-insensitive)
+        return ' '.join(search_fields).lower()
+    
+    def find_all_keywords(self, bill_data):
+        """Return every configured keyword found in the bill, in a single regex scan"""
+        if not bill_data:
+            return set()
         
-        # Enhanced keyword matching
-        keyword_variations = [
-            target_keyword.lower(),
-            target_keyword.lower().replace(' review', ''),  # "utilization" matches "utilization review"
-            target_keyword.lower().replace(' ', ''),        # Handle spacing issues
-        ]
+        matched = set()
+        for spelling in KEYWORD_RE.findall(self._combined_search_text(bill_data)):
+            matched |= _VARIATION_KEYWORDS[spelling]
+        return matched
+    
+    def check_keyword_match(self, bill_data, target_keyword):
+        """Enhanced keyword matching with flexibility"""
+        if not bill_data:
+            return False, target_keyword
+        
+        bill = bill_data.get('bill', {}) if 'bill' in bill_data else bill_data
         
-        # Check for any variation
-        for variation in keyword_variations:
-            if variation in combined_text:
-                logging.debug(f" Keyword '{target_keyword}' found in bill {bill.get('bill number ','unkow')}")
-                return True, target_keyword
+        if target_keyword in _KEYWORD_VARIATIONS:
+            is_match = target_keyword in self.find_all_keywords(bill_data)
+        else:
+            # Ad-hoc keyword outside config - fall back to a plain substring scan
+            combined_text = self._combined_search_text(bill_data)
+            is_match = any(v in combined_text for v in _keyword_variations(target_keyword))
+        
+        if is_match:
+            logging.debug(f" Keyword '{target_keyword}' found in bill {bill.get('bill_number', 'unknown')}")
+            return True, target_keyword
         
         # If strict matching fails, trust API results for now
         logging.info(f"Keyword '{target_keyword}' not found in bill {bill.get('bill_number', 'unknown')} - filtering out ")
@@ -218,26 +276,34 @@ class BillProcessor:
         return bill.get('url', 'No link available')
 
     
+    @staticmethod
+    def _bill_key(bill):
+        """Identity of a processed bill for deduplication"""
+        return bill['State'], bill['Bill Number']
+    
     def add_bill(self, processed_bill):
-        """Add a processed bill to the collection"""
+        """Add a processed bill to the collection, skipping ones already added"""
         if processed_bill:
-            self.processed_bills.append(processed_bill)
-            self.processing_stats['total_processed'] += 1
+            self.add_bills_bulk([processed_bill])
+    
+    def add_bills_bulk(self, processed_bills):
+        """Add a batch of processed bills under a single lock acquisition, skipping ones already added"""
+        processed_bills = [bill for bill in processed_bills if bill]
+        if processed_bills:
+            with self._lock:
+                for bill in processed_bills:
+                    key = self._bill_key(bill)
+                    if key in self._seen_bills:
+                        self.processing_stats['duplicates_removed'] += 1
+                        continue
+                    self._seen_bills.add(key)
+                    self.processed_bills.append(bill)
+                    self.processing_stats['total_processed'] += 1
             
     def remove_duplicates(self):
         """Remove duplicate bills based on state and bill number"""
-        seen = set()
-        unique_bills = []
-        
-        for bill in self.processed_bills:
-            identifier = (bill['State'], bill['Bill Number'])
-            if identifier not in seen:
-                seen.add(identifier)
-                unique_bills.append(bill)
-            else:
-                self.processing_stats['duplicates_removed'] += 1
-                #logging.info(f"Removed duplicate: {bill['State']} {bill['Bill Number']}")
-        
+        unique_bills = dedup_by(self.processed_bills, self._bill_key)
+        self.processing_stats['duplicates_removed'] += len(self.processed_bills) - len(unique_bills)
         self.processed_bills = unique_bills
         
     def save_to_excel(self, output_file=OUTPUT_FILE):
@@ -251,31 +317,26 @@ class BillProcessor:
         self.remove_duplicates()
         
         try:
-            df = pd.DataFrame(self.processed_bills)
+            columns = list(self.processed_bills[0].keys())
+            rows = [[bill.get(column, '') for column in columns] for bill in self.processed_bills]
             
             # Ensure output directory exists
             import os
             os.makedirs(os.path.dirname(output_file), exist_ok=True)
             
-            # Save to Excel with formatting
-            with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-                df.to_excel(writer, sheet_name='Bills', index=False)
-                
-                # Get the workbook and worksheet
-                worksheet = writer.sheets['Bills']
-                
-                # Auto-adjust column widths (optimized)
-                for column in worksheet.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    adjusted_width = min(max_length + 2, 50)  # Cap at 50 characters
-                    worksheet.column_dimensions[column_letter].width = adjusted_width
+            # Stream rows straight to disk - no DataFrame and no in-memory worksheet
+            workbook = Workbook(write_only=True)
+            worksheet = workbook.create_sheet('Bills')
+            
+            # Auto-adjust column widths (set up front, write-only sheets can't be revisited)
+            for index, column in enumerate(columns):
+                max_length = max(len(str(value)) for value in [column] + [row[index] for row in rows])
+                worksheet.column_dimensions[get_column_letter(index + 1)].width = min(max_length + 2, 50)  # Cap at 50 characters
+            
+            worksheet.append(columns)
+            for row in rows:
+                worksheet.append(row)
+            workbook.save(output_file)
             
             logging.info(f"Saved {len(self.processed_bills)} bills to {output_file}")
             print(f"Successfully saved {len(self.processed_bills)} bills to {output_file}")
@@ -300,28 +361,35 @@ class BillProcessor:
         return self.processing_stats
     
     def process_bills_batch_parallel(self, bill_ids, api_handler):
-        """Process multiple bills with parallel execution"""
-        processed_bills = []
+        """Process multiple bills with parallel execution, fetching each bill at most once per run"""
+        bill_ids = list(dict.fromkeys(bill_ids))
+        
+        # Claim bills nobody has asked for yet; ones fetched or in flight for another keyword are awaited instead
+        claimed = {}
+        with self._lock:
+            for bill_id in bill_ids:
+                if bill_id not in self._bill_cache:
+                    self._bill_cache[bill_id] = claimed[bill_id] = Future()
+            futures = [self._bill_cache[bill_id] for bill_id in bill_ids]
         
         def process_single_bill_wrapper(bill_id):
             """Wrapper for single bill processing"""
-            return self._process_single_bill(bill_id, api_handler)
+            try:
+                result, settled = self._fetch_target_bill(bill_id, api_handler)
+            except Exception as e:
+                logging.error(f"Error processing bill {bill_id}: {e}")
+                result, settled = None, False
+            if not settled:
+                # Failed fetch - forget it so a later keyword retries this bill
+                with self._lock:
+                    if self._bill_cache.get(bill_id) is claimed[bill_id]:
+                        del self._bill_cache[bill_id]
+            claimed[bill_id].set_result(result)
         
-        # Process bills in parallel
-        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_BILLS) as executor:
-            future_to_bill = {
-                executor.submit(process_single_bill_wrapper, bill_id): bill_id
-                for bill_id in bill_ids
-            }
-            
-            for future in as_completed(future_to_bill):
-                bill_id = future_to_bill[future]
-                try:
-                    result = future.result()
-                    if result:
-                        processed_bills.append(result)
-                except Exception as e:
-                    logging.error(f"Error processing bill {bill_id}: {e}")
+        # Process claimed bills in parallel
+        if claimed:
+            with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_BILLS) as executor:
+                executor.map(process_single_bill_wrapper, claimed)
         
-        return processed_bills
+        return [result for result in (future.result() for future in futures) if result]
 
@@ -9,12 +9,28 @@ import pandas as pd
 from datetime import datetime
 import re
 import os
+import json
 import urllib.parse
+import lxml.html
+from scraper_common import block_heavy_resources, save_bills_xlsx
 
 # Configuration
 STATE = "Georgia"
 SESSIONS = ["1033"]  # 2025-2026 regular session
 OUTPUT_FILE = "Georgia_Bills_All_Keywords.xlsx"
+PROGRESS_FILE = ".georgia_progress.jsonl"  # Append-only per-bill checkpoint, retired after a successful save
+
+# Placeholders extract_bill_details_selenium returns when extraction itself failed (as opposed to
+# a field the page genuinely lacks). Bills carrying one are not checkpointed, so a resume retries them.
+EXTRACTION_ERROR_VALUES = {
+    "Error extracting summary", "Error extracting sponsors", "Error extracting action",
+    "Summary extraction error", "Sponsor extraction error", "Last action extraction error",
+}
+
+# The search URL already filters by keyword server-side (?k=). When True, the
+# keyword is re-checked against summary + title after detail extraction, which
+# also catches bills whose title lacks the phrase but whose summary has it.
+VALIDATE_TITLE_MATCH = False
 
 # All Keywords - Same as Connecticut
 KEYWORDS = [
@@ -41,19 +57,29 @@ chrome_options.add_argument("--disable-gpu")
 chrome_options.add_argument("--no-sandbox")
 chrome_options.add_argument("--disable-dev-shm-usage")
 
+# Precompiled patterns - longest keywords first so 'prompt payment' wins over 'prompt pay'
+_WS_RE = re.compile(r'\s+')
+_KW_RE = re.compile('|'.join(re.escape(k.lower()) for k in sorted(KEYWORDS, key=len, reverse=True)))
+
 def normalize_text(text):
     """Normalize text for keyword matching"""
     if not text:
         return ""
-    return re.sub(r'\s+', ' ', text).strip().lower()
+    return _WS_RE.sub(' ', text).strip().lower()
 
-def contains_keyword(text, keywords):
+def contains_keyword(text):
     """Check if text contains any of the keywords as exact phrases (case-insensitive)"""
-    text_norm = normalize_text(text)
-    for keyword in keywords:
-        if keyword.lower() in text_norm:
-            return True, keyword
-    return False, None
+    m = _KW_RE.search(normalize_text(text))
+    return (True, m.group()) if m else (False, None)
+
+# Returns [[date, status], ...] for the status history table, or null if it is missing
+STATUS_HISTORY_JS = """
+const body = document.querySelector('app-status-history-list table tbody');
+if (!body) return null;
+return Array.from(body.querySelectorAll('tr')).map(r => r.cells.length >= 2
+    ? [r.cells[0].innerText.trim(), r.cells[1].innerText.trim()]
+    : ['', '']);
+"""
 
 def extract_bill_details_selenium(driver, bill_url):
     """Visit individual bill page and extract summary, sponsors, and last action"""
@@ -96,36 +122,30 @@ def extract_bill_details_selenium(driver, bill_url):
         # Extract Last Action from Status History - get most recent based on date
         last_action = ""
         try:
-            # Find the status history table
-            status_table = driver.find_element(By.CSS_SELECTOR, "app-status-history-list table tbody")
-            rows = status_table.find_elements(By.TAG_NAME, "tr")
+            # Pull every (date, status) pair in a single round-trip
+            rows = driver.execute_script(STATUS_HISTORY_JS)
+            
+            if rows is None:
+                raise NoSuchElementException("app-status-history-list table")
             
             if rows:
-                # Parse all rows to find the most recent date
-                most_recent_date = None
-                most_recent_action = ""
-                
-                for row in rows:
-                    cols = row.find_elements(By.TAG_NAME, "td")
-                    if len(cols) >= 2:
-                        date_text = cols[0].text.strip()  # Date column
-                        status_text = cols[1].text.strip()  # Status column
-                        
-                        if date_text and status_text:
-                            try:
-                                # Parse date (format: MM/DD/YYYY)
-                                parsed_date = datetime.strptime(date_text, '%m/%d/%Y')
-                                
-                                # Keep the most recent date
-                                if most_recent_date is None or parsed_date > most_recent_date:
-                                    most_recent_date = parsed_date
-                                    most_recent_action = f"{date_text} - {status_text}"
-                            except ValueError:
-                                # If date parsing fails, just use first valid entry
-                                if not most_recent_action:
-                                    most_recent_action = f"{date_text} - {status_text}"
+                # Parse all rows to find the most recent date (format: MM/DD/YYYY)
+                valid_rows = [(d, st) for d, st in rows if d and st]
+                dated_rows = []
+                for date_text, status_text in valid_rows:
+                    try:
+                        dated_rows.append((datetime.strptime(date_text, '%m/%d/%Y'), date_text, status_text))
+                    except ValueError:
+                        continue
                 
-                last_action = most_recent_action if most_recent_action else "No recent action found"
+                if dated_rows:
+                    _, date_text, status_text = max(dated_rows, key=lambda r: r[0])
+                    last_action = f"{date_text} - {status_text}"
+                elif valid_rows:
+                    # If date parsing fails, just use first valid entry
+                    last_action = f"{valid_rows[0][0]} - {valid_rows[0][1]}"
+                else:
+                    last_action = "No recent action found"
                 print(f"      📅 Last Action extracted: {last_action}")
             else:
                 last_action = "No status history found"
@@ -143,41 +163,24 @@ def extract_bill_details_selenium(driver, bill_url):
         print(f"      ❌ Error extracting bill details: {e}")
         return "Error extracting summary", "Error extracting sponsors", "Error extracting action"
 
-def get_max_pages(driver, base_url, keyword, session):
-    """Get the total number of pages for a keyword search"""
+def get_max_pages(driver, keyword):
+    """Get the total number of pages for a keyword search from the already-loaded first page"""
     try:
-        # Construct URL for first page
-        encoded_keyword = urllib.parse.quote(keyword)
-        search_url = f"{base_url}?k={encoded_keyword}&s={session}&p=1"
-        
-        driver.get(search_url)
-        time.sleep(3)
-        
         # Look for pagination information
-        try:
-            # Try to find pagination elements
-            pagination = driver.find_elements(By.CSS_SELECTOR, ".pagination .page-link")
-            if pagination:
-                # Get the last page number (excluding "Next" button)
-                page_numbers = []
-                for link in pagination:
-                    text = link.text.strip()
-                    if text.isdigit():
-                        page_numbers.append(int(text))
-                
-                max_page = max(page_numbers) if page_numbers else 1
-                print(f"    📄 Found {max_page} pages for keyword '{keyword}'")
-                return max_page
-            else:
-                print(f"    📄 No pagination found, assuming 1 page for keyword '{keyword}'")
-                return 1
-                
-        except Exception as e:
-            print(f"    ⚠️  Could not determine page count: {e}")
+        pagination = driver.find_elements(By.CSS_SELECTOR, ".pagination .page-link")
+        if pagination:
+            # Get the last page number (excluding "Next" button)
+            page_numbers = [int(text) for link in pagination if (text := link.text.strip()).isdigit()]
+            
+            max_page = max(page_numbers) if page_numbers else 1
+            print(f"    📄 Found {max_page} pages for keyword '{keyword}'")
+            return max_page
+        else:
+            print(f"    📄 No pagination found, assuming 1 page for keyword '{keyword}'")
             return 1
             
     except Exception as e:
-        print(f"    ❌ Error getting max pages: {e}")
+        print(f"    ⚠️  Could not determine page count: {e}")
         return 1
 
 def search_bills_by_keyword(driver, keyword, session):
@@ -187,60 +190,61 @@ def search_bills_by_keyword(driver, keyword, session):
     try:
         print(f"  🔍 Searching for keyword: '{keyword}'")
         
-        # Get total number of pages for this keyword
-        max_pages = get_max_pages(driver, base_url, keyword, session)
-        
         all_bills = []
+        encoded_keyword = urllib.parse.quote(keyword)
         
-        # Search through all pages
-        for page in range(1, max_pages + 1):
-            print(f"    📑 Processing page {page}/{max_pages}")
+        # Search through all pages - the page count is read from page 1 during
+        # the same visit, so no separate discovery navigation is needed
+        page = 0
+        max_pages = 1
+        while page < max_pages:
+            page += 1
             
             # Construct search URL
-            encoded_keyword = urllib.parse.quote(keyword)
             search_url = f"{base_url}?k={encoded_keyword}&s={session}&p={page}"
             
             print(f"    🔍 Navigating to: {search_url}")
             driver.get(search_url)
             time.sleep(3)
             
+            if page == 1:
+                max_pages = get_max_pages(driver, keyword)
+            
+            print(f"    📑 Processing page {page}/{max_pages}")
+            
             # Extract bill information from search results table
             try:
-                # Find the results table
-                table = driver.find_element(By.CSS_SELECTOR, "table")
-                rows = table.find_elements(By.CSS_SELECTOR, "tbody tr")
+                # Serialize the results table once and parse it locally with lxml,
+                # instead of a WebDriver round-trip per row/cell
+                table_html = driver.find_element(By.CSS_SELECTOR, "table").get_attribute("outerHTML")
+                rows = lxml.html.fromstring(table_html).xpath('./tbody/tr')
                 
                 print(f"    📊 Found {len(rows)} bills on page {page}")
                 
                 for i, row in enumerate(rows, 1):
                     try:
-                        cols = row.find_elements(By.TAG_NAME, "td")
+                        cols = row.xpath('./td')
                         if len(cols) >= 2:
                             # Extract bill number and link from first column
-                            bill_link_element = cols[0].find_element(By.TAG_NAME, "a")
-                            bill_number = bill_link_element.text.strip()
-                            bill_url = bill_link_element.get_attribute("href")
+                            bill_link_element = cols[0].xpath('.//a')[0]
+                            bill_number = _WS_RE.sub(' ', bill_link_element.text_content()).strip()
+                            bill_url = urllib.parse.urljoin(search_url, bill_link_element.get('href'))
                             
                             # Extract bill title from second column
-                            title_link = cols[1].find_element(By.TAG_NAME, "a")
-                            bill_title = title_link.text.strip()
+                            title_link = cols[1].xpath('.//a')[0]
+                            bill_title = _WS_RE.sub(' ', title_link.text_content()).strip()
                             
                             print(f"      📄 Row {i}: {bill_number} - {bill_title[:60]}...")
                             
-                            # Apply keyword filtering - only include bills that actually contain the keyword
-                            has_keyword, matched_keyword = contains_keyword(bill_title, [keyword])
-                            
-                            if has_keyword:
-                                all_bills.append({
-                                    'bill_number': bill_number,
-                                    'bill_title': bill_title,
-                                    'bill_url': bill_url,
-                                    'matched_keyword': matched_keyword,
-                                    'session': session
-                                })
-                                print(f"        ✅ MATCH: {bill_number} - '{matched_keyword}'")
-                            else:
-                                print(f"        ⏭️  No exact match for '{keyword}'")
+                            # The server already filtered on the keyword; any re-validation
+                            # happens after summary extraction (see VALIDATE_TITLE_MATCH)
+                            all_bills.append({
+                                'bill_number': bill_number,
+                                'bill_title': bill_title,
+                                'bill_url': bill_url,
+                                'matched_keyword': keyword,
+                                'session': session
+                            })
                                 
                     except Exception as e:
                         print(f"      ❌ Error processing row {i}: {e}")
@@ -260,25 +264,75 @@ def search_bills_by_keyword(driver, keyword, session):
         print(f"    ❌ Error searching for keyword '{keyword}': {e}")
         return []
 
+def extraction_failed(details):
+    """Whether any (summary, sponsors, last_action) value is an extraction-error placeholder"""
+    return any(value in EXTRACTION_ERROR_VALUES for value in details)
+
+def load_progress(session):
+    """Load bills already extracted for a session by an interrupted run"""
+    done = {}
+    if os.path.exists(PROGRESS_FILE):
+        try:
+            with open(PROGRESS_FILE, encoding='utf-8') as fp:
+                for line in fp:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Partially written final line
+                    if record.get('session') == session and not extraction_failed(
+                        (record['bill']['Summary'], record['bill']['Sponsors'], record['bill']['Last Action'])
+                    ):
+                        done[record['bill']['Bill Number']] = record['bill']
+        except Exception as e:
+            print(f"Warning: Could not read progress file {PROGRESS_FILE}: {e}")
+    if done:
+        print(f"  ♻️  Resuming session {session}: {len(done)} bills already extracted")
+    return done
+
 def scrape_bills_for_session_selenium(session, keywords):
     """Scrape all bills for a given session from Georgia legislature using Selenium"""
     print(f"\n🚀 Scraping Georgia bills for session {session}...")
     
     driver = webdriver.Chrome(options=chrome_options)
+    block_heavy_resources(driver)
     
     try:
-        all_bills = []
-        
+        # Gather cheap (bill_number, bill_url) matches for every keyword first,
+        # unioned on bill URL so each detail page is loaded exactly once
+        unique_matches = {}
+        matched_keywords = {}
         for keyword in keywords:
             print(f"\n  🔍 Processing keyword: '{keyword}'")
-            keyword_bills = search_bills_by_keyword(driver, keyword, session)
-            
-            # Extract detailed information for each matching bill
-            for bill_info in keyword_bills:
-                print(f"\n    🏛️  Processing {bill_info['bill_number']}...")
+            for bill_info in search_bills_by_keyword(driver, keyword, session):
+                unique_matches.setdefault(bill_info['bill_url'], bill_info)
+                matched_keywords.setdefault(bill_info['bill_url'], []).append(keyword)
+        
+        # Join the matched keywords once per bill, outside the per-row loop
+        for bill_url, bill_info in unique_matches.items():
+            bill_info['matched_keyword'] = ', '.join(matched_keywords[bill_url])
+        
+        print(f"\n  🧮 {len(unique_matches)} unique bills to process")
+        
+        # Bills finished by a previous, interrupted run are reused as-is
+        completed = load_progress(session)
+        all_bills = list(completed.values())
+        with open(PROGRESS_FILE, 'a', encoding='utf-8') as progress_fp:
+            # Extract detailed information for each unique matching bill
+            for bill_info in unique_matches.values():
+                if bill_info['bill_number'] in completed:
+                    continue
+                
+                print(f"\n    🏛️  Processing {bill_info['bill_number']} (keywords: {bill_info['matched_keyword']})...")
                 
                 summary, sponsors, last_action = extract_bill_details_selenium(driver, bill_info['bill_url'])
                 
+                if VALIDATE_TITLE_MATCH:
+                    has_keyword, matched_keyword = contains_keyword(f"{summary} {bill_info['bill_title']}")
+                    if not has_keyword:
+                        print(f"    ⏭️  No exact keyword match in title or summary")
+                        continue
+                    print(f"    ✅ MATCH: {bill_info['bill_number']} - '{matched_keyword}'")
+                
                 bill_data = {
                     "Year": "2025-2026",  # Since session 1033 covers both years
                     "State": STATE,
@@ -292,21 +346,19 @@ def scrape_bills_for_session_selenium(session, keywords):
                 }
                 
                 all_bills.append(bill_data)
-                print(f"    ✅ Bill processed successfully")
+                
+                # Only checkpoint clean extractions - transient failures are retried on resume
+                if extraction_failed((summary, sponsors, last_action)):
+                    print(f"    ⚠️  Bill kept with extraction errors (not checkpointed)")
+                else:
+                    progress_fp.write(json.dumps({'session': session, 'bill': bill_data}) + '\n')
+                    progress_fp.flush()
+                    print(f"    ✅ Bill processed successfully")
                 
                 time.sleep(2)  # Be polite to the server
         
-        # Remove duplicates (same bill might match multiple keywords)
-        seen_bills = set()
-        unique_bills = []
-        for bill in all_bills:
-            bill_key = (bill['Year'], bill['Bill Number'])
-            if bill_key not in seen_bills:
-                seen_bills.add(bill_key)
-                unique_bills.append(bill)
-        
-        print(f"\n📊 Session {session}: Found {len(unique_bills)} unique bills matching keywords")
-        return unique_bills
+        print(f"\n📊 Session {session}: Found {len(all_bills)} unique bills matching keywords")
+        return all_bills
         
     except Exception as e:
         print(f"❌ Error scraping bills for session {session}: {e}")
@@ -329,17 +381,13 @@ def save_data(existing_df, new_bills, filepath):
         print("No new bills to save")
         return
         
-    new_df = pd.DataFrame(new_bills)
-    
-    if existing_df.empty:
-        combined_df = new_df
-    else:
-        combined_df = pd.concat([existing_df, new_df], ignore_index=True)
-        combined_df.drop_duplicates(subset=['Year', 'Bill Number'], keep='last', inplace=True)
+    # Rows are written in order, one at a time - the only way constant_memory mode keeps every cell
+    total = save_bills_xlsx(existing_df, new_bills, filepath)
+    print(f"✅ Saved {total} total bills to {filepath}")
     
-    combined_df.sort_values(by=['Year', 'Bill Number'], inplace=True)
-    combined_df.to_excel(filepath, index=False)
-    print(f"✅ Saved {len(combined_df)} total bills to {filepath}")
+    # Everything checkpointed is now in the Excel file; retire the progress log
+    if os.path.exists(PROGRESS_FILE):
+        os.replace(PROGRESS_FILE, PROGRESS_FILE.replace('.jsonl', '.done'))
 
 def main():
     print("🚀 Georgia State Legislature Bill Scraper")
@@ -13,11 +13,31 @@ import pandas as pd
 from datetime import datetime
 import re
 import os
+import functools
+from dataclasses import dataclass
+from operator import attrgetter
+import sqlite3
+import argparse
+from contextlib import closing
+import multiprocessing
+from multiprocessing.util import Finalize
+import requests
+from requests.adapters import HTTPAdapter
+import lxml.html
+import urllib.parse
+import ahocorasick
+from scraper_common import write_rows_xlsx
 
 # Configuration
 STATE = "Kansas"
 SESSION = "2025_26"  # 2025-2026 session
 OUTPUT_FILE = "Kansas_Bills_All_Keywords.xlsx"
+RESULTS_DB = "kansas_bills.sqlite"  # Append-as-you-go store; the Excel file is exported from it
+
+OUTPUT_COLUMNS = [
+    "Year", "State", "Bill Number", "Bill Title/Topic", "Summary",
+    "Sponsors", "Last Action", "Bill Link", "Extracted Date",
+]
 
 # All Keywords - Same as Connecticut & Georgia
 KEYWORDS = [
@@ -44,19 +64,72 @@ chrome_options.add_argument("--window-size=1920,1080")
 chrome_options.add_argument("--disable-gpu")
 chrome_options.add_argument("--no-sandbox")
 chrome_options.add_argument("--disable-dev-shm-usage")
+# Only DOM text is read, so skip images, stylesheets and webfonts entirely
+chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+chrome_options.add_argument("--disable-extensions")
+chrome_options.add_argument("--disable-background-networking")
+chrome_options.add_argument("--disable-sync")
+chrome_options.add_experimental_option("prefs", {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.stylesheets": 2,
+    "profile.managed_default_content_settings.fonts": 2,
+})
+
+# Placeholders extract_bill_details_selenium returns when extraction failed. Matched exactly -
+# summary is the bill title, which may itself contain the word "error".
+EXTRACTION_ERROR_VALUES = {
+    "Sponsor extraction error", "Last action extraction error",
+    "Error extracting sponsors", "Error extracting action",
+}
+
+# Worker pool - Selenium is not thread-safe, so each worker process owns its own driver
+POOL_SIZE = 4
+MAX_USES_PER_DRIVER = 50  # Recycle a worker's driver after this many navigations
+
+# Attach to a long-lived chromedriver (e.g. `chromedriver --port=9515` run as a
+# service) instead of paying Chrome startup per run; unset means launch locally
+CHROMEDRIVER_URL = os.environ.get("CHROMEDRIVER_URL")  # e.g. "http://127.0.0.1:9515"
+
+# Bill pages serve their portlets/history server-side, so details are fetched over
+# plain HTTP first; Selenium is only the fallback for JS-rendered pages
+http_session = requests.Session()
+http_session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+http_session.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+})
+
+# On-disk cache of bill details keyed by URL; entries younger than the TTL are
+# reused outright, older ones are revalidated with conditional requests
+CACHE_FILE = "kansas_bill_cache.sqlite"
+CACHE_TTL_SECONDS = 7 * 24 * 3600
+
+SPONSOR_XPATH = (
+    "//div[contains(concat(' ', normalize-space(@class), ' '), ' portlet ')]"
+    "[.//div[contains(@class, 'portlet-header')]"
+    "[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'original sponsor')]]"
+    "//span[contains(@class, 'tab-group')]//li[contains(@class, 'module-item')]/a"
+)
+
+# History dates look like "Thu, Jan 16, 2025"
+_MONTH_RE = re.compile(r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\b')
+_DATE_RE = re.compile(r'([A-Z][a-z]{2} \d{1,2}, \d{4})')
+
+# Keyword matching - one Aho-Corasick automaton scans a title for all keywords in a single pass
+_WS_RE = re.compile(r'\s+')
+_KEYWORD_AUTOMATON = ahocorasick.Automaton()
+for _keyword in KEYWORDS:
+    _KEYWORD_AUTOMATON.add_word(_keyword.lower(), _keyword)
+_KEYWORD_AUTOMATON.make_automaton()
 
+@functools.lru_cache(maxsize=4096)
 def normalize_text(text):
-    """Normalize text for keyword matching"""
-    if not text:
-        return ""
-    return re.sub(r'\s+', ' ', text).strip().lower()
+    """Normalize text for keyword matching (memoized - titles repeat across overlapping pages)"""
+    return _WS_RE.sub(' ', text).strip().lower() if text else ""
 
-def contains_keyword(text, keywords):
+def contains_keyword(text):
     """Check if text contains any of the keywords as exact phrases (case-insensitive)"""
-    text_norm = normalize_text(text)
-    for keyword in keywords:
-        if keyword.lower() in text_norm:
-            return True, keyword
+    for _, keyword in _KEYWORD_AUTOMATON.iter(normalize_text(text)):
+        return True, keyword
     return False, None
 
 def get_max_pages(driver):
@@ -64,10 +137,13 @@ def get_max_pages(driver):
     try:
         # Go to the first page to check pagination
         driver.get("https://kslegislature.gov/li/b2025_26/measures/bills/#1")
-        time.sleep(3)
         
         # Look for the next-nav element with page information
         try:
+            WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located((By.ID, "tab-disp"))
+            )
+            
             # Find the div with id="tab-disp" that contains "Page X of Y"
             tab_disp = driver.find_element(By.ID, "tab-disp")
             disp_text = tab_disp.text.strip()  # Should be like "Page 71 of 71"
@@ -81,7 +157,7 @@ def get_max_pages(driver):
                 print(f"    ⚠️  Could not parse page info: {disp_text}")
                 return 71  # Fallback
                 
-        except NoSuchElementException:
+        except (NoSuchElementException, TimeoutException):
             print(f"    ⚠️  Navigation element not found")
             return 71  # Fallback
         except ValueError as e:
@@ -92,46 +168,171 @@ def get_max_pages(driver):
         print(f"    ❌ Error getting max pages: {e}")
         return 71  # Fallback
 
+# Text of the first sponsor link in the "Original Sponsor" portlet, or null
+SPONSOR_JS = """
+for (const portlet of document.querySelectorAll('div.portlet')) {
+    const header = portlet.querySelector('div.portlet-header');
+    if (!header || !header.textContent.toLowerCase().includes('original sponsor')) continue;
+    const link = portlet.querySelector(
+        'div.portlet-content span.tab-group div.module div.infinite-tabs ul.module-list li.module-item a');
+    if (link) return link.textContent.trim();
+}
+return null;
+"""
+
+# Cell texts of the bill history tbody, or of every table row when it is missing
+HISTORY_JS = """
+const toRows = rows => Array.from(rows).map(
+    r => Array.from(r.querySelectorAll('td')).map(c => c.innerText.trim()));
+const tbody = document.getElementById('history-tab-1');
+if (tbody) return {history: toRows(tbody.querySelectorAll('tr')), tables: null};
+return {history: null, tables: toRows(document.querySelectorAll('table tr'))};
+"""
+
+def pick_most_recent_action(rows):
+    """Return the status of the most recent dated row from [date, chamber, status, ...] rows"""
+    if not rows:
+        return "No history entries found"
+    
+    most_recent_date = None
+    most_recent_status = ""
+    
+    for cols in rows:
+        if len(cols) < 3:
+            continue
+        date_text, status_text = cols[0], cols[2]
+        
+        # Check if this is a meaningful entry with actual date, e.g. "Thu, Jan 16, 2025"
+        if not (date_text and status_text):
+            continue
+        
+        date_match = _DATE_RE.search(date_text)
+        if date_match:
+            parsed_date = datetime.strptime(date_match.group(1), '%b %d, %Y')
+            
+            if most_recent_date is None or parsed_date > most_recent_date:
+                most_recent_date = parsed_date
+                most_recent_status = status_text
+        elif _MONTH_RE.search(date_text) and not most_recent_status:
+            # Has a month but no parseable date - keep as a fallback
+            most_recent_status = status_text
+    
+    return most_recent_status if most_recent_status else "No meaningful action found"
+
+def _cache_connect():
+    """Open the bill-detail cache, creating the table on first use"""
+    conn = sqlite3.connect(CACHE_FILE, timeout=30)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS cache ("
+        "url TEXT PRIMARY KEY, fetched_at INTEGER, etag TEXT, last_modified TEXT, "
+        "summary TEXT, sponsors TEXT, last_action TEXT)"
+    )
+    return conn
+
+def load_cached_details(bill_url):
+    """Return the cached detail row for a bill URL as a dict, or None"""
+    try:
+        with closing(_cache_connect()) as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute("SELECT * FROM cache WHERE url = ?", (bill_url,)).fetchone()
+            return dict(row) if row else None
+    except sqlite3.Error as e:
+        print(f"      ⚠️  Could not read detail cache: {e}")
+        return None
+
+def store_cached_details(bill_url, details, etag="", last_modified=""):
+    """Insert or refresh the cached (summary, sponsors, last_action) for a bill URL"""
+    # Never cache extraction failures
+    if any(value in EXTRACTION_ERROR_VALUES for value in details):
+        return
+    try:
+        with closing(_cache_connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (bill_url, int(time.time()), etag, last_modified, *details)
+            )
+    except sqlite3.Error as e:
+        print(f"      ⚠️  Could not write detail cache: {e}")
+
+def extract_bill_details_http(bill_url, bill_title, cached=None):
+    """Fetch a bill page over HTTP and extract sponsors and last action with lxml.
+    
+    When a cached entry is given its validators are sent, and a 304 reuses it.
+    Returns None when the page has no server-rendered portlets, so the caller
+    can fall back to Selenium.
+    """
+    headers = {}
+    if cached:
+        if cached['etag']:
+            headers['If-None-Match'] = cached['etag']
+        if cached['last_modified']:
+            headers['If-Modified-Since'] = cached['last_modified']
+    
+    try:
+        print(f"      🌐 Fetching details over HTTP: {bill_url}")
+        response = http_session.get(bill_url, headers=headers, timeout=15)
+        if response.status_code == 304 and cached:
+            print(f"      ♻️  Not modified, using cached details")
+            details = (cached['summary'], cached['sponsors'], cached['last_action'])
+            store_cached_details(bill_url, details, cached['etag'], cached['last_modified'])
+            return details
+        response.raise_for_status()
+        tree = lxml.html.fromstring(response.content)
+    except Exception as e:
+        print(f"      ⚠️  HTTP fetch failed, falling back to Selenium: {e}")
+        return None
+    
+    if not tree.xpath("//div[contains(concat(' ', normalize-space(@class), ' '), ' portlet ')]"):
+        print(f"      ⚠️  No server-rendered portlets, falling back to Selenium")
+        return None
+    
+    # Summary is the same as title for Kansas (as specified)
+    summary = bill_title
+    
+    sponsor_links = tree.xpath(SPONSOR_XPATH)
+    sponsors = sponsor_links[0].text_content().strip() if sponsor_links else ""
+    if not sponsors:
+        sponsors = "Sponsor information not available"
+    print(f"      👤 Original Sponsor extracted: {sponsors}")
+    
+    rows = [
+        [td.text_content().strip() for td in tr.xpath('./td')]
+        for tr in tree.xpath('//tbody[@id="history-tab-1"]/tr')
+    ]
+    last_action = pick_most_recent_action(rows)
+    print(f"      📅 Final Last Action: {last_action}")
+    
+    details = (summary, sponsors, last_action)
+    store_cached_details(
+        bill_url, details,
+        response.headers.get('ETag', ''), response.headers.get('Last-Modified', '')
+    )
+    return details
+
 def extract_bill_details_selenium(driver, bill_url, bill_number, bill_title):
     """Visit individual bill page and extract sponsors and last action using correct HTML selectors"""
     try:
         print(f"      📄 Extracting details from: {bill_url}")
         driver.get(bill_url)
-        time.sleep(5)
+        try:
+            WebDriverWait(driver, 15).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "div.portlet"))
+            )
+        except TimeoutException:
+            print(f"      ⚠️  Bill page portlets did not load in time")
         
         # Summary is the same as title for Kansas (as specified)
         summary = bill_title
         print(f"      📋 Summary: {summary[:100]}...")
         
-        # Extract Original Sponsor - handle hidden dropdown
+        # Extract Original Sponsor - textContent is read in-page, so a collapsed
+        # (display: none) dropdown does not need to be expanded first
         sponsors = ""
         try:
-            portlets = driver.find_elements(By.CSS_SELECTOR, "div.portlet")
-            
-            for portlet in portlets:
-                try:
-                    header = portlet.find_element(By.CSS_SELECTOR, "div.portlet-header")
-                    if "original sponsor" in header.text.lower():
-                        print(f"      🎯 Found Original Sponsor portlet")
-                        
-                        content_div = portlet.find_element(By.CSS_SELECTOR, "div.portlet-content")
-                        style = content_div.get_attribute("style")
-                        
-                        if "display: none" in style:
-                            print(f"      🔽 Expanding hidden sponsor dropdown")
-                            header.click()
-                            time.sleep(2)
-                        
-                        sponsor_link = content_div.find_element(By.CSS_SELECTOR, 
-                            "span.tab-group div.module div.infinite-tabs ul.module-list li.module-item a")
-                        sponsors = sponsor_link.text.strip()
-                        print(f"      👤 Original Sponsor extracted: {sponsors}")
-                        break
-                        
-                except NoSuchElementException:
-                    continue
-            
-            if not sponsors:
+            sponsors = driver.execute_script(SPONSOR_JS) or ""
+            if sponsors:
+                print(f"      👤 Original Sponsor extracted: {sponsors}")
+            else:
                 sponsors = "Sponsor information not available"
                 
         except Exception as e:
@@ -147,114 +348,24 @@ def extract_bill_details_selenium(driver, bill_url, bill_number, bill_title):
                 EC.presence_of_element_located((By.TAG_NAME, "table"))
             )
             
-            # Strategy 1: Look specifically for the bill history tbody by ID
-            try:
-                history_tbody = driver.find_element(By.CSS_SELECTOR, "tbody#history-tab-1")
-                print(f"      ✅ Found bill history tbody with id 'history-tab-1'")
-                
-                rows = history_tbody.find_elements(By.TAG_NAME, "tr")
-                print(f"      📊 Found {len(rows)} history entries in bill history tbody")
-                
-                if rows:
-                    most_recent_date = None
-                    most_recent_status = ""
-                    
-                    for i, row in enumerate(rows):
-                        cols = row.find_elements(By.TAG_NAME, "td")
-                        print(f"        🔍 Row {i+1} has {len(cols)} columns")
-                        
-                        if len(cols) >= 3:
-                            date_text = cols[0].text.strip()
-                            chamber_text = cols[1].text.strip()
-                            status_text = cols[2].text.strip()
-                            
-                            print(f"        📅 Row {i+1}: Date='{date_text}' | Chamber='{chamber_text}' | Status='{status_text[:50]}...'")
-                            
-                            # Check if this is a meaningful entry with actual date
-                            if (date_text and status_text and 
-                                any(month in date_text for month in ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
-                                                                   'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'])):
-                                
-                                try:
-                                    # Parse date to find most recent
-                                    clean_date = date_text
-                                    if ", " in date_text and len(date_text.split(", ")) >= 2:
-                                        parts = date_text.split(", ")
-                                        clean_date = ", ".join(parts[1:])
-                                    
-                                    parsed_date = datetime.strptime(clean_date, '%b %d, %Y')
-                                    
-                                    if most_recent_date is None or parsed_date > most_recent_date:
-                                        most_recent_date = parsed_date
-                                        most_recent_status = status_text
-                                        print(f"        ✅ Updated most recent status: {most_recent_status}")
-                                        
-                                except ValueError as ve:
-                                    print(f"        ⚠️  Date parsing failed for '{date_text}': {ve}")
-                                    if not most_recent_status:
-                                        most_recent_status = status_text
-                            else:
-                                print(f"        ⏭️  Skipping row (no proper date or status)")
-                    
-                    last_action = most_recent_status if most_recent_status else "No meaningful action found"
-                    
-                else:
-                    last_action = "No history entries found"
-                    
-            except NoSuchElementException:
+            # One round-trip returns every cell's text for the history table (or all tables)
+            history = driver.execute_script(HISTORY_JS)
+            
+            # Strategy 1: the bill history tbody with id 'history-tab-1'
+            if history['history'] is not None:
+                print(f"      📊 Found {len(history['history'])} history entries in bill history tbody")
+                last_action = pick_most_recent_action(history['history'])
+            else:
                 print(f"      ⚠️  Bill history tbody with id 'history-tab-1' not found")
                 
-                # Strategy 2: Look for tbody that contains actual bill history data
+                # Strategy 2: rows anywhere on the page that look like bill history data
                 print(f"      🔄 Strategy 2: Looking for bill history data in all tables...")
-                
-                # Find all tables on the page
-                tables = driver.find_elements(By.TAG_NAME, "table")
-                print(f"      📊 Found {len(tables)} total tables on page")
-                
-                found_history = False
-                for table_index, table in enumerate(tables):
-                    print(f"      🔍 Checking table {table_index + 1}...")
-                    
-                    # Look for table rows that contain actual dates
-                    rows = table.find_elements(By.CSS_SELECTOR, "tr")
-                    
-                    for row_index, row in enumerate(rows):
-                        cols = row.find_elements(By.TAG_NAME, "td")
-                        if len(cols) >= 3:
-                            date_text = cols[0].text.strip()
-                            chamber_text = cols[1].text.strip()
-                            status_text = cols[2].text.strip()
-                            
-                            # Check if this looks like bill history data
-                            if (date_text and chamber_text and status_text and
-                                any(month in date_text for month in ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
-                                                                   'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']) and
-                                chamber_text.lower() in ['senate', 'house']):
-                                
-                                print(f"        ✅ Found bill history row in table {table_index + 1}: {date_text} | {chamber_text} | {status_text[:50]}...")
-                                
-                                try:
-                                    clean_date = date_text
-                                    if ", " in date_text and len(date_text.split(", ")) >= 2:
-                                        parts = date_text.split(", ")
-                                        clean_date = ", ".join(parts[1:])
-                                    
-                                    parsed_date = datetime.strptime(clean_date, '%b %d, %Y')
-                                    
-                                    if not found_history or parsed_date > most_recent_date:
-                                        most_recent_date = parsed_date
-                                        most_recent_status = status_text
-                                        found_history = True
-                                        print(f"        🎯 New most recent action: {most_recent_status}")
-                                        
-                                except ValueError:
-                                    if not found_history:
-                                        most_recent_status = status_text
-                                        found_history = True
-                
-                if found_history:
-                    last_action = most_recent_status
-                else:
+                history_rows = [
+                    cols for cols in history['tables']
+                    if len(cols) >= 3 and cols[1] and cols[1].lower() in ['senate', 'house']
+                ]
+                last_action = pick_most_recent_action(history_rows)
+                if last_action == "No history entries found":
                     last_action = "No meaningful action found"
             
             print(f"      📅 Final Last Action: {last_action}")
@@ -272,22 +383,93 @@ def extract_bill_details_selenium(driver, bill_url, bill_number, bill_title):
 
 
 
+def scrape_listing_pages_http():
+    """Fetch the bill listing once over HTTP and parse every page's tab with lxml.
+    
+    The #N pagination only toggles which bill-tab-N div is shown, so all pages
+    are present in the server HTML. Returns a list of per-page bill lists, or
+    None when the tabs are not server-rendered and Selenium must be used.
+    """
+    listing_url = "https://kslegislature.gov/li/b2025_26/measures/bills/"
+    try:
+        print(f"    🌐 Fetching bill listing over HTTP: {listing_url}")
+        response = http_session.get(listing_url, timeout=30)
+        response.raise_for_status()
+        tree = lxml.html.fromstring(response.content)
+    except Exception as e:
+        print(f"    ⚠️  HTTP listing fetch failed, falling back to Selenium: {e}")
+        return None
+    
+    tabs = tree.xpath('//div[starts-with(@id, "bill-tab-")]')
+    if not tabs:
+        print(f"    ⚠️  Listing tabs not server-rendered, falling back to Selenium")
+        return None
+    
+    tabs.sort(key=lambda tab: int(tab.get('id').rsplit('-', 1)[-1]))
+    print(f"    📄 Found {len(tabs)} pages in the listing HTML")
+    
+    page_results = []
+    for tab in tabs:
+        bills_on_page = []
+        for item in tab.xpath('.//li'):
+            links = item.xpath('.//a')
+            if not links:
+                continue
+            link = links[0]
+            link_text = link.text_content().strip()
+            if not link_text:
+                continue
+            
+            # Format appears to be: "SB1 - Bill title description"
+            if " - " in link_text:
+                bill_number, bill_title = (part.strip() for part in link_text.split(" - ", 1))
+            else:
+                bill_number = bill_title = link_text
+            
+            has_keyword, matched_keyword = contains_keyword(bill_title)
+            if has_keyword:
+                bills_on_page.append({
+                    'bill_number': bill_number,
+                    'bill_title': bill_title,
+                    'bill_url': urllib.parse.urljoin(listing_url, link.get('href')),
+                    'matched_keyword': matched_keyword
+                })
+                print(f"        ✅ MATCH: {bill_number} - '{matched_keyword}'")
+        page_results.append(bills_on_page)
+    
+    return page_results
+
+# First link of each bill item, so one query replaces the item lookup plus a per-item link lookup
+BILL_ITEM_LINK_XPATH = ".//*[contains(@class, 'module-item') or self::li]/descendant::a[1]"
+VISIBLE_BILL_ITEM_LINK_XPATH = (
+    "//*[contains(@class, 'infinite-tabs')]"
+    "//*[(contains(@class, 'module-item') or self::li) and not(contains(@style, 'display: none'))]"
+    "/descendant::a[1]"
+)
+
 def scrape_bills_from_page(driver, page_num):
     """Scrape all bills from a single page using correct HTML structure"""
     try:
         # Construct URL for the page
-        page_url = f"https://kslegislature.gov/li/b2025_26/measures/bills/#{page_num}"
+        listing_url = "https://kslegislature.gov/li/b2025_26/measures/bills/"
+        page_url = f"{listing_url}#{page_num}"
         
         print(f"    📑 Scraping page {page_num}: {page_url}")
-        driver.get(page_url)
-        time.sleep(4)  # Wait for page to load
+        if driver.current_url.split("#", 1)[0] == listing_url:
+            # Already on the listing - a hash change lets the page JS switch tabs without a reload
+            driver.execute_script("window.location.hash = arguments[0];", str(page_num))
+        else:
+            driver.get(page_url)
         
         # Wait for the page to actually change and load the correct content
         try:
-            # Wait for the page number indicator to update
+            # Wait for the page number indicator to update, then for this page's tab content
             WebDriverWait(driver, 10).until(
                 EC.text_to_be_present_in_element((By.ID, "tab-disp-num"), str(page_num))
             )
+            WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located((By.ID, f"bill-tab-{page_num}"))
+            )
             print(f"    ✅ Page {page_num} loaded successfully")
         except TimeoutException:
             print(f"    ⚠️  Page {page_num} may not have loaded properly")
@@ -296,18 +478,12 @@ def scrape_bills_from_page(driver, page_num):
         
         # Find bills inside infinite-tabs class structure
         try:
-            # Wait a bit more for the content to load
-            time.sleep(2)
-            
-            # Look for the infinite-tabs container
-            infinite_tabs = driver.find_element(By.CSS_SELECTOR, ".infinite-tabs")
-            
             # Find the currently visible tab content for this page
             # The content should be in a div with id like "bill-tab-{page_num}"
             current_tab_content = driver.find_element(By.ID, f"bill-tab-{page_num}")
             
-            # Find all bill items within the current tab content only
-            bill_items = current_tab_content.find_elements(By.CSS_SELECTOR, ".module-item, li")
+            # One compound query returns each bill item's link directly
+            bill_items = current_tab_content.find_elements(By.XPATH, BILL_ITEM_LINK_XPATH)
             
             print(f"    📊 Found {len(bill_items)} bills on page {page_num}")
             
@@ -319,10 +495,8 @@ def scrape_bills_from_page(driver, page_num):
             if len(bill_items) > 20:  # Something's wrong if we see more than 20 bills
                 print(f"    ⚠️  Warning: Found {len(bill_items)} bills, expected ~10. Pagination may not be working.")
             
-            for i, item in enumerate(bill_items, 1):
+            for i, bill_link in enumerate(bill_items, 1):
                 try:
-                    # Find the bill link within each item
-                    bill_link = item.find_element(By.TAG_NAME, "a")
                     bill_url = bill_link.get_attribute("href")
                     
                     # Extract bill number and title from the link text or nearby elements
@@ -346,7 +520,7 @@ def scrape_bills_from_page(driver, page_num):
                     print(f"      📄 Item {i}: {bill_number} - {bill_title[:60]}...")
                     
                     # Apply keyword filtering
-                    has_keyword, matched_keyword = contains_keyword(bill_title, KEYWORDS)
+                    has_keyword, matched_keyword = contains_keyword(bill_title)
                     
                     if has_keyword:
                         bills_on_page.append({
@@ -367,9 +541,8 @@ def scrape_bills_from_page(driver, page_num):
             print(f"    ❌ No content found for page {page_num}")
             # Try alternative method - look for any visible bill items
             try:
-                infinite_tabs = driver.find_element(By.CSS_SELECTOR, ".infinite-tabs")
-                # Get only visible items (not hidden ones from other pages)
-                bill_items = infinite_tabs.find_elements(By.CSS_SELECTOR, ".module-item:not([style*='display: none']), li:not([style*='display: none'])")
+                # Get only visible items (not hidden ones from other pages), straight to their links
+                bill_items = driver.find_elements(By.XPATH, VISIBLE_BILL_ITEM_LINK_XPATH)
                 
                 # If we still get too many, there might be a different structure
                 if len(bill_items) > 50:
@@ -378,10 +551,9 @@ def scrape_bills_from_page(driver, page_num):
                 
                 print(f"    📊 Found {len(bill_items)} visible bills on page {page_num}")
                 
-                for i, item in enumerate(bill_items, 1):
+                for i, bill_link in enumerate(bill_items, 1):
                     # Same processing logic as above...
                     try:
-                        bill_link = item.find_element(By.TAG_NAME, "a")
                         bill_url = bill_link.get_attribute("href")
                         link_text = bill_link.text.strip()
                         
@@ -398,7 +570,7 @@ def scrape_bills_from_page(driver, page_num):
                         
                         print(f"      📄 Item {i}: {bill_number} - {bill_title[:60]}...")
                         
-                        has_keyword, matched_keyword = contains_keyword(bill_title, KEYWORDS)
+                        has_keyword, matched_keyword = contains_keyword(bill_title)
                         
                         if has_keyword:
                             bills_on_page.append({
@@ -428,71 +600,136 @@ def scrape_bills_from_page(driver, page_num):
         print(f"    ❌ Error scraping page {page_num}: {e}")
         return []
 
-def scrape_all_kansas_bills_selenium():
+# Per-process driver state for pool workers
+_worker_driver = None
+_worker_uses = 0
+_force_rescrape = False
+
+def new_driver():
+    """Create a driver session, on the shared remote chromedriver when configured"""
+    if CHROMEDRIVER_URL:
+        return webdriver.Remote(command_executor=CHROMEDRIVER_URL, options=chrome_options)
+    return webdriver.Chrome(options=chrome_options)
+
+def _quit_worker_driver():
+    """Shut down this worker's driver when the worker process exits"""
+    global _worker_driver
+    if _worker_driver is not None:
+        try:
+            _worker_driver.quit()
+        except Exception:
+            pass
+        _worker_driver = None
+
+def _init_driver(force_rescrape=False):
+    """Pool initializer: per-worker settings only - Chrome starts on the first task that needs it.
+    
+    Starting it here would launch a browser per worker even when HTTP does all the work,
+    and a missing chromedriver would make the pool respawn failing workers forever.
+    """
+    global _force_rescrape
+    _force_rescrape = force_rescrape
+    Finalize(None, _quit_worker_driver, exitpriority=10)
+
+def _get_worker_driver():
+    """Return this worker's driver, starting it on first use and recycling it every MAX_USES_PER_DRIVER navigations.
+    
+    A driver that cannot start raises here, failing only the task that asked for it.
+    """
+    global _worker_driver, _worker_uses
+    if _worker_driver is None or _worker_uses >= MAX_USES_PER_DRIVER:
+        _quit_worker_driver()
+        _worker_driver = new_driver()
+        _worker_uses = 0
+    _worker_uses += 1
+    return _worker_driver
+
+def get_max_pages_worker(_=None):
+    """Pool task: detect the total page count"""
+    return get_max_pages(_get_worker_driver())
+
+def scrape_bills_from_page_worker(page_num):
+    """Pool task: scrape and keyword-filter a single listing page"""
+    return scrape_bills_from_page(_get_worker_driver(), page_num)
+
+def extract_bill_details_worker(bill_info):
+    """Pool task: extract details for one matched bill and build its output row"""
+    print(f"\n    🏛️  Processing {bill_info['bill_number']}...")
+    
+    cached = None if _force_rescrape else load_cached_details(bill_info['bill_url'])
+    if cached and cached['fetched_at'] > time.time() - CACHE_TTL_SECONDS:
+        print(f"      ♻️  Using cached details for {bill_info['bill_number']}")
+        details = (cached['summary'], cached['sponsors'], cached['last_action'])
+    else:
+        details = extract_bill_details_http(bill_info['bill_url'], bill_info['bill_title'], cached)
+        if details is None:
+            try:
+                driver = _get_worker_driver()
+            except Exception as e:
+                print(f"      ❌ Could not start browser for {bill_info['bill_number']}: {e}")
+                details = (bill_info['bill_title'], "Error extracting sponsors", "Error extracting action")
+            else:
+                details = extract_bill_details_selenium(
+                    driver, 
+                    bill_info['bill_url'], 
+                    bill_info['bill_number'], 
+                    bill_info['bill_title']
+                )
+                store_cached_details(bill_info['bill_url'], details)
+    summary, sponsors, last_action = details
+    
+    return BillRow(
+        bill_info['bill_number'],
+        bill_info['bill_title'],
+        summary,
+        sponsors,
+        last_action,
+        bill_info['bill_url'],
+    )
+
+def scrape_all_kansas_bills_selenium(force_rescrape=False):
     """Scrape all bills from Kansas legislature with proper page detection"""
     print(f"\n🚀 Scraping Kansas bills for session {SESSION}...")
     print("📄 Using navigation element to detect total pages")
+    print(f"⚙️  Using {POOL_SIZE} worker processes")
     
-    driver = webdriver.Chrome(options=chrome_options)
+    pool = multiprocessing.Pool(POOL_SIZE, initializer=_init_driver, initargs=(force_rescrape,))
     
     try:
-        all_bills = []
-        
-        # Get total page count from navigation
-        max_pages = get_max_pages(driver)
-        print(f"Processing {max_pages} pages with keyword filtering")
+        # Phase 1: one HTTP request covers every listing page when the tabs are server-rendered
+        page_results = scrape_listing_pages_http()
         
-        # Scrape all pages (no early stopping since we know the exact count)
-        for page_num in range(1, max_pages + 1):
-            print(f"\n  📑 Processing page {page_num}/{max_pages}")
-            
-            bills_on_page = scrape_bills_from_page(driver, page_num)
+        if page_results is None:
+            # Get total page count from navigation
+            max_pages = pool.apply(get_max_pages_worker)
+            print(f"Processing {max_pages} pages with keyword filtering")
             
+            # Otherwise scrape all listing pages in parallel (no early stopping since we know the exact count)
+            page_results = pool.map(scrape_bills_from_page_worker, range(1, max_pages + 1))
+        
+        # Deduplicate on URL as bills are collected, so overlapping pages never
+        # cost an extra detail extraction
+        matched_bills = []
+        seen_urls = set()
+        for page_num, bills_on_page in enumerate(page_results, 1):
             if not bills_on_page:
                 print(f"    ℹ️  No matching bills found on page {page_num}")
                 continue
-            
-            # Extract detailed information for each matching bill
             for bill_info in bills_on_page:
-                print(f"\n    🏛️  Processing {bill_info['bill_number']}...")
-                
-                summary, sponsors, last_action = extract_bill_details_selenium(
-                    driver, 
-                    bill_info['bill_url'], 
-                    bill_info['bill_number'], 
-                    bill_info['bill_title']
-                )
-                
-                bill_data = {
-                    "Year": "2025-2026",
-                    "State": STATE,
-                    "Bill Number": bill_info['bill_number'],
-                    "Bill Title/Topic": bill_info['bill_title'],
-                    "Summary": summary,
-                    "Sponsors": sponsors,
-                    "Last Action": last_action,
-                    "Bill Link": bill_info['bill_url'],
-                    "Extracted Date": datetime.today().strftime("%Y-%m-%d"),
-                }
-                
-                all_bills.append(bill_data)
-                print(f"    ✅ Bill processed successfully")
-                
-                time.sleep(2)
-            
-            # Add a small delay between pages
-            time.sleep(1)
+                if bill_info['bill_url'] in seen_urls:
+                    print(f"    🔄 Duplicate removed: {bill_info['bill_number']}")
+                    continue
+                seen_urls.add(bill_info['bill_url'])
+                matched_bills.append(bill_info)
         
-        # Remove duplicates
-        seen_bills = set()
+        # Phase 2: extract detailed information for each matching bill in parallel,
+        # recording each one as it completes so a crash loses nothing finished
         unique_bills = []
-        for bill in all_bills:
-            bill_key = bill['Bill Number']
-            if bill_key not in seen_bills:
-                seen_bills.add(bill_key)
-                unique_bills.append(bill)
-            else:
-                print(f"    🔄 Duplicate removed: {bill_key}")
+        with closing(_results_connect()) as results_conn:
+            for bill_row in pool.imap(extract_bill_details_worker, matched_bills):
+                record_bills(results_conn, [bill_row_record(bill_row)])
+                unique_bills.append(bill_row)
+        print(f"    ✅ {len(unique_bills)} bills processed successfully")
         
         print(f"\n📊 Total unique bills found: {len(unique_bills)}")
         return unique_bills
@@ -501,65 +738,119 @@ def scrape_all_kansas_bills_selenium():
         print(f"❌ Error scraping Kansas bills: {e}")
         return []
     finally:
-        driver.quit()
+        # close + join (not terminate) so each worker's Finalize quits its Chrome
+        pool.close()
+        pool.join()
 
-def load_existing_data(filepath):
-    """Load existing Excel data if it exists"""
-    if os.path.exists(filepath):
-        try:
-            existing_df = pd.read_excel(filepath, engine='openpyxl')
-            print(f"📂 Loaded existing data: {len(existing_df)} bills")
-            return existing_df
-        except Exception as e:
-            print(f"Warning: Could not load existing file {filepath}: {e}")
-    return pd.DataFrame()
+@dataclass(slots=True)
+class BillRow:
+    """One extracted bill. Year, State and Extracted Date are per-run constants added by bill_row_record."""
+    bill_number: str
+    bill_title: str
+    summary: str
+    sponsors: str
+    last_action: str
+    bill_url: str
+
+_BILL_ROW_FIELDS = attrgetter('bill_number', 'bill_title', 'summary', 'sponsors', 'last_action', 'bill_url')
+
+def _results_connect():
+    """Open the results database, creating the bills table on first use"""
+    conn = sqlite3.connect(RESULTS_DB, timeout=30)
+    columns = ", ".join(
+        f'"{col}" TEXT PRIMARY KEY' if col == "Bill Number" else f'"{col}" TEXT'
+        for col in OUTPUT_COLUMNS
+    )
+    conn.execute(f"CREATE TABLE IF NOT EXISTS bills ({columns})")
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+    return conn
+
+def bill_row_record(bill_row):
+    """A BillRow as a results-database row, in OUTPUT_COLUMNS order"""
+    bill_number, bill_title, summary, sponsors, last_action, bill_url = _BILL_ROW_FIELDS(bill_row)
+    return ("2025-2026", STATE, bill_number, bill_title, summary, sponsors, last_action, bill_url,
+            datetime.today().strftime("%Y-%m-%d"))
+
+def dataframe_records(bills_df):
+    """DataFrame rows as results-database rows, in OUTPUT_COLUMNS order"""
+    return ([None if pd.isna(value) else str(value) for value in row]
+            for row in bills_df.reindex(columns=OUTPUT_COLUMNS).itertuples(index=False, name=None))
+
+def record_bills(conn, records, replace=True):
+    """Insert rows (in OUTPUT_COLUMNS order) into the results database (latest wins per Bill Number unless replace=False)"""
+    columns = ", ".join(f'"{col}"' for col in OUTPUT_COLUMNS)
+    placeholders = ", ".join("?" for _ in OUTPUT_COLUMNS)
+    verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+    with conn:
+        conn.executemany(f"{verb} INTO bills ({columns}) VALUES ({placeholders})", records)
+
+def seed_results_db(filepath):
+    """Seed the results database from the Excel file once, before any scrape writes to it.
+    
+    A "seeded" marker row (not the database file's existence) records that this happened,
+    and seeded rows never overwrite bills already in the database.
+    """
+    try:
+        with closing(_results_connect()) as conn:
+            if conn.execute("SELECT 1 FROM meta WHERE key = 'seeded'").fetchone():
+                return
+            if os.path.exists(filepath):
+                seed_df = pd.read_excel(filepath, engine='openpyxl')
+                record_bills(conn, dataframe_records(seed_df), replace=False)
+                print(f"📥 Seeded {RESULTS_DB} from {filepath}")
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('seeded', ?)",
+                             (datetime.today().strftime("%Y-%m-%d"),))
+    except Exception as e:
+        print(f"Warning: Could not seed {RESULTS_DB} from {filepath}: {e}")
 
-def save_data(existing_df, new_bills, filepath):
-    """Save data to Excel, updating existing bills and preventing duplicates"""
+def save_data(new_bills, filepath):
+    """Export every bill in the results database to Excel, sorted by Bill Number (latest wins per bill)"""
     if not new_bills:
         print("No new bills to save")
         return
-        
-    new_df = pd.DataFrame(new_bills)
     
-    if existing_df.empty:
-        combined_df = new_df
-        print(f"📝 Creating new file with {len(new_df)} bills")
-    else:
-        # Combine and remove duplicates based on Bill Number (keep latest)
-        combined_df = pd.concat([existing_df, new_df], ignore_index=True)
-        
-        # Remove duplicates, keeping the latest entry (last occurrence)
-        combined_df.drop_duplicates(subset=['Bill Number'], keep='last', inplace=True)
+    with closing(_results_connect()) as conn:
+        # Already recorded as they finished; re-recording is idempotent and covers callers that didn't
+        record_bills(conn, [bill_row_record(bill) for bill in new_bills])
+        columns = ", ".join(f'"{col}"' for col in OUTPUT_COLUMNS)
         
-        print(f"🔄 Updated data: {len(combined_df)} total bills (removed duplicates)")
-    
-    # Sort by Bill Number for better organization
-    combined_df.sort_values(by=['Bill Number'], inplace=True)
-    
-    # Save to Excel
-    combined_df.to_excel(filepath, index=False)
-    print(f"✅ Saved {len(combined_df)} total bills to {filepath}")
+        # Write a temp file and swap it in so a crash never leaves a truncated workbook
+        root, ext = os.path.splitext(filepath)
+        tmp_path = f"{root}.tmp{ext}"
+        total = write_rows_xlsx(
+            tmp_path, OUTPUT_COLUMNS,
+            conn.execute(f'SELECT {columns} FROM bills ORDER BY "Bill Number"')
+        )
+    os.replace(tmp_path, filepath)
+    print(f"✅ Saved {total} total bills to {filepath}")
 
 def main():
+    parser = argparse.ArgumentParser(description="Kansas State Legislature Bill Scraper")
+    parser.add_argument("--force-rescrape", action="store_true",
+                        help="Ignore the on-disk bill detail cache and refetch every bill")
+    args = parser.parse_args()
+    
     print("🚀 Kansas State Legislature Bill Scraper")
     print(f"Processing {len(KEYWORDS)} keywords with proper page detection")
     print(f"Session: {SESSION}")
     print("="*70)
     
+    # Seed the results database from the existing workbook before the scrape starts recording bills
+    seed_results_db(OUTPUT_FILE)
+    
     # Scrape all bills
-    all_scraped_bills = scrape_all_kansas_bills_selenium()
+    all_scraped_bills = scrape_all_kansas_bills_selenium(force_rescrape=args.force_rescrape)
     
     print(f"\n🎯 Total bills scraped: {len(all_scraped_bills)}")
     
     if all_scraped_bills:
-        # Load existing data and save (with duplicate prevention)
-        existing_df = load_existing_data(OUTPUT_FILE)
-        save_data(existing_df, all_scraped_bills, OUTPUT_FILE)
+        # Export the results database (seeded at startup, so it holds earlier runs' bills too)
+        save_data(all_scraped_bills, OUTPUT_FILE)
         
         print("\n📊 RESULTS SUMMARY:")
         for bill in all_scraped_bills:
-            print(f"  • {bill['Bill Number']}: {bill['Bill Title/Topic'][:60]}...")
+            print(f"  • {bill.bill_number}: {bill.bill_title[:60]}...")
         
         print(f"\n✅ Kansas scraper completed successfully!")
         print(f"📁 Results saved to: {OUTPUT_FILE}")
@@ -9,15 +9,32 @@ import time
 import os
 import sys
 import logging
-from datetime import datetime
+import logging.handlers
+import json
+import hashlib
+import argparse
+import asyncio
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, asdict, fields, replace
+from operator import attrgetter
+from datetime import date, datetime
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
-from bs4 import BeautifulSoup
-import pandas as pd
+from selenium.common.exceptions import InvalidSessionIdException, TimeoutException, WebDriverException
+import lxml.html
+from lxml import etree
+import xlsxwriter
 import re
+from urllib.parse import urljoin
 
 # Keywords to search for
 KEYWORDS = [
@@ -41,12 +58,131 @@ TARGET_SESSIONS = {
     '2026': '2026 Regular Session'
 }
 
+# ASP.NET control IDs on BillSearch.aspx
+SUMMARY_TAB_ID = "ctl00_ctl00_PageBody_PageContent_btnHeadSummary"
+SUMMARY_INPUT_ID = "ctl00_ctl00_PageBody_PageContent_tbSummary"
+SUMMARY_SEARCH_ID = "ctl00_ctl00_PageBody_PageContent_btnSearchBySummary"
+
+VIEWSTATE_ERROR_MARKERS = ("Validation of viewstate MAC failed", "Invalid postback or callback argument")
+
+HIDDEN_INPUTS_XPATH = etree.XPath('//input[@type="hidden"][@name]')
+NO_RESULTS_MARKERS = ("no bills found", "no results", "no bills were found")
+
+CHECKPOINT_FILE = ".louisiana_checkpoint_{session_year}.jsonl"  # Append-only per-keyword results, retired after a successful save
+
+PAGE_CACHE_DIR = ".louisiana_page_cache"  # Raw results pages keyed by sha1(keyword|session|date)
+PAGE_CACHE_TTL_SECONDS = 6 * 3600
+
+HTTP_CONCURRENCY = 5  # Keyword searches in flight at once over the shared HTTP session
+# When True, a keyword containing a shorter keyword ('Prompt payment' / 'Prompt pay') is not
+# searched; it is answered from the shorter keyword's results, filtered on title + summary.
+# Only exact while the site's summary search matches substrings, so it is opt-in.
+DERIVE_LONGER_KEYWORDS = False
+
+BROWSER_WORKERS = 5  # Parallel browsers for the Selenium fallback
+MAX_USES_PER_DRIVER = 50  # Searches before a pooled browser is recycled
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.svg', '*.ico', '*.css', '*.woff*',
+    '*analytics*', '*gtag*', '*googletagmanager*',
+]
+
+log = logging.getLogger(__name__)
+
+HTTP_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Keep-alive session for the browser-primed POSTs, sized for one connection per browser worker
+http_session = requests.Session()
+http_session.mount("https://", HTTPAdapter(
+    pool_connections=BROWSER_WORKERS,
+    pool_maxsize=BROWSER_WORKERS,
+    max_retries=Retry(total=3, backoff_factor=0.3),  # Connection failures are retried before falling back to the browser
+))
+http_session.headers.update(HTTP_HEADERS)
+
+# Sponsor extraction fallbacks
+_AUTHOR_RE = re.compile(r'\b[A-Z]{3,15}\b')
+_EXCLUDE_WORDS = frozenset({'BILL', 'ACT', 'HOUSE', 'SENATE', 'MORE', 'CURRENT', 'STATUS', 'SIGNED', 'PASSED', 'GOVERNOR', 'PRESIDENT'})
+_EXCLUDE_CELL_PATTERNS = ('more...', 'billinfo', 'considered', 'status', 'current')
+_UNKNOWN_NAMES = frozenset({'', 'UNKNOWN'})
+
+# Compiled XPath queries for the results table, evaluated in C by lxml
+_XP_RESULTS_TABLE = etree.XPath('//table[contains(concat(" ", normalize-space(@class), " "), " ResultsListTable ")]')
+_XP_ROWS = etree.XPath('tbody/tr')
+_XP_BILL_LINK = etree.XPath('.//a[contains(@href, "BillInfo.aspx")]')
+_XP_STATUS = etree.XPath('.//span[contains(@id, "LabelStatus")]')
+_XP_SUMMARY = etree.XPath('.//span[contains(@id, "LabelKWordAndSTitle")]')
+_XP_AUTHOR_LINKS = etree.XPath(
+    './/a[contains(@href, "senate.la.gov") or contains(@href, "house.la.gov") or contains(@id, "LinkAuthor")]'
+)
+_XP_CELLS = etree.XPath('.//*[self::td or self::th]')
+_XP_TEXT = etree.XPath('.//text()')  # Text nodes only, unlike itertext() which includes comments
+
+def _is_legis_href(href):
+    """Author profile links on the senate/house sites"""
+    return 'senate.la.gov' in href or 'house.la.gov' in href
+
+def _derivable_keywords(pending, keywords):
+    """Map each pending keyword that contains a shorter keyword to the shortest such keyword"""
+    derived = {}
+    for keyword in pending:
+        roots = [root for root in keywords if root != keyword and root.lower() in keyword.lower()]
+        if roots:
+            derived[keyword] = min(roots, key=len)
+    return derived
+
+def _first(xpath, elem):
+    """First match of a compiled XPath, or None"""
+    matches = xpath(elem)
+    return matches[0] if matches else None
+
+def _stripped_text(elem):
+    """Concatenated, individually stripped text nodes of an element"""
+    return ''.join(text.strip() for text in _XP_TEXT(elem))
+
+def _no_results_shown(driver):
+    """WebDriverWait predicate: the page shows any "no results" message, in any case"""
+    body = driver.execute_script("return document.body ? document.body.innerText : ''")
+    body_lower = body.lower()
+    return any(marker in body_lower for marker in NO_RESULTS_MARKERS)
+
+def _leaf_text(elem):
+    """Stripped text of a leaf tag, only walking descendants when it has nested markup"""
+    return (elem.text or '').strip() if len(elem) == 0 else _stripped_text(elem)
+
+@dataclass(slots=True, frozen=True)
+class BillRecord:
+    """One bill found by a keyword search; immutable so records can be shared across worker threads and keywords"""
+    year: str
+    state: str
+    bill_number: str
+    bill_title: str
+    summary: str
+    sponsors: str
+    last_action: str
+    bill_link: str
+    extracted_date: str
+    matched_keyword: str
+
+BILL_RECORD_COLUMNS = [f.name for f in fields(BillRecord)]
+_BILL_RECORD_FIELDS = attrgetter(*BILL_RECORD_COLUMNS)
+
 class LouisianaBillScraper:
-    def __init__(self):
+    def __init__(self, refresh=False, browser_fallback=True):
         self.base_url = "https://www.legis.la.gov"
         self.search_url = "https://www.legis.la.gov/Legis/BillSearch.aspx"
+        self.search_page_url = f"{self.search_url}?sid=current"
+        self.bill_base_url = f"{self.base_url}/Legis/"
         self.scraped_data = []
         self.script_dir = os.path.dirname(os.path.abspath(__file__))
+        self.refresh = refresh  # Ignore cached results pages and search the site again
+        self.browser_fallback = browser_fallback  # Retry failed HTTP searches in headless Chrome
+        self._summary_form = None  # Cached (hidden fields, input name, button name, button value)
+        self._form_lock = None
+        self._sponsor_cache = {}  # (session_year, bill_number) -> sponsors, shared across keywords
+        self._sponsor_lock = threading.Lock()  # Browser workers parse on their own threads
+        self._driver_pool = queue.Queue()  # Idle (browser, use count) pairs for the Selenium fallback, created on demand
         
     def get_chrome_options(self):
         """Get Chrome options for maximum stability"""
@@ -57,7 +193,6 @@ class LouisianaBillScraper:
         chrome_options.add_argument("--disable-gpu")
         chrome_options.add_argument("--disable-extensions")
         chrome_options.add_argument("--disable-plugins")
-        chrome_options.add_argument("--disable-images")
         chrome_options.add_argument("--window-size=1920,1080")
         chrome_options.add_argument("--memory-pressure-off")
         chrome_options.add_argument("--disable-background-timer-throttling")
@@ -67,29 +202,90 @@ class LouisianaBillScraper:
         chrome_options.add_argument("--disable-ipc-flooding-protection")
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
+        chrome_options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2,
+            'profile.default_content_setting_values.notifications': 2,
+        })
+        chrome_options.page_load_strategy = 'eager'  # driver.get returns at DOMContentLoaded
         
         return chrome_options
     
+    def _new_driver(self):
+        """Start a fallback browser with heavy resources blocked"""
+        # Each pooled browser is checked out by one thread at a time, so one kept-alive
+        # WebDriver connection per driver is enough and the connection pool never contends
+        driver = webdriver.Chrome(options=self.get_chrome_options(), keep_alive=True)
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+        except Exception as e:
+            print(f"⚠️  Could not enable resource blocking: {e}")
+        return driver
+    
+    @staticmethod
+    def _quit_driver(driver):
+        """Quit a browser, ignoring errors from an already dead session"""
+        try:
+            driver.quit()
+            print("🔄 Browser closed")
+        except Exception:
+            pass
+    
+    def _checkout_driver(self):
+        """Take an idle pooled browser and its use count, starting a new one if none is usable"""
+        while True:
+            try:
+                driver, uses = self._driver_pool.get_nowait()
+            except queue.Empty:
+                return self._new_driver(), 0
+            
+            if uses >= MAX_USES_PER_DRIVER:
+                # Recycle long-lived browsers before leaked memory slows them down
+                self._quit_driver(driver)
+                continue
+            
+            try:
+                driver.current_url  # Cheap liveness probe
+            except WebDriverException:
+                print("⚠️  Browser session lost, starting a new one")
+                self._quit_driver(driver)
+                continue
+            
+            return driver, uses
+    
+    def _checkin_driver(self, driver, uses):
+        """Return a healthy browser to the pool for the next keyword"""
+        self._driver_pool.put((driver, uses))
+    
+    def _close_all_drivers(self):
+        """Drain the pool and quit every browser"""
+        while True:
+            try:
+                driver, _ = self._driver_pool.get_nowait()
+            except queue.Empty:
+                return
+            self._quit_driver(driver)
+    
     def search_single_keyword_isolated(self, keyword, session_year="2025"):
-        """Search for a single keyword with isolated browser session"""
-        print(f"🔍 Searching for keyword: '{keyword}' in {session_year}")
+        """Search for a single keyword in a pooled browser, starting from a clean session state"""
+        log.debug("🔍 Searching for keyword: '%s' in %s", keyword, session_year)
         
-        driver = None
         results = []
+        driver = None
         
         try:
-            # Create fresh browser instance for this keyword only
-            chrome_options = self.get_chrome_options()
-            driver = webdriver.Chrome(options=chrome_options)
-            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            driver, uses = self._checkout_driver()
             wait = WebDriverWait(driver, 20)
             
-            # Navigate to search page
-            search_url_with_session = f"{self.search_url}?sid=current"
-            driver.get(search_url_with_session)
-            time.sleep(3)
+            # Clear state left by the previous keyword (all domains), then navigate to search page
+            try:
+                driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            except Exception:
+                driver.delete_all_cookies()
+            driver.get(self.search_page_url)
             
-            print("✅ Navigated to search page")
+            log.debug("✅ Navigated to search page")
             
             # Check if page loaded properly
             if "Bill Search" not in driver.title:
@@ -97,164 +293,323 @@ class LouisianaBillScraper:
             
             # Step 1: Click "Search by Summary" button
             summary_button = wait.until(
-                EC.element_to_be_clickable((By.ID, "ctl00_ctl00_PageBody_PageContent_btnHeadSummary"))
+                EC.element_to_be_clickable((By.ID, SUMMARY_TAB_ID))
             )
             driver.execute_script("arguments[0].click();", summary_button)
-            time.sleep(3)
+            summary_input = wait.until(EC.visibility_of_element_located((By.ID, SUMMARY_INPUT_ID)))
             
-            print("✅ Clicked 'Search by Summary' button")
+            log.debug("✅ Clicked 'Search by Summary' button")
             
-            # Step 2: Find and fill the summary input field
-            summary_input = wait.until(
-                EC.presence_of_element_located((By.ID, "ctl00_ctl00_PageBody_PageContent_tbSummary"))
-            )
+            # The browser has primed the form; submit the search itself as one plain POST
+            try:
+                page_source = self._post_summary_search(driver, keyword)
+                self._write_page_cache(keyword, session_year, page_source)
+                results = self.parse_search_results_isolated(page_source, keyword, session_year)
+                log.info("📊 Found %d results for '%s' (browser-primed POST)", len(results), keyword)
+                return results
+            except Exception as e:
+                log.warning("⚠️  Direct POST failed for '%s', submitting in the browser: %s", keyword, e)
             
+            # Step 2: Fill the summary input field found by the visibility wait
             driver.execute_script("arguments[0].value = '';", summary_input)
             summary_input.send_keys(keyword)
-            time.sleep(1)
             
-            print(f"✅ Entered keyword: '{keyword}'")
+            log.debug("✅ Entered keyword: '%s'", keyword)
             
             # Step 3: Click search button
             search_button = wait.until(
-                EC.element_to_be_clickable((By.ID, "ctl00_ctl00_PageBody_PageContent_btnSearchBySummary"))
+                EC.element_to_be_clickable((By.ID, SUMMARY_SEARCH_ID))
             )
             driver.execute_script("arguments[0].click();", search_button)
             
-            print("✅ Clicked search button")
+            log.debug("✅ Clicked search button")
             
-            # Wait for results
-            time.sleep(5)
+            # Wait for either the results table or a "no bills found" message
+            results_loaded = True
+            try:
+                wait.until(EC.any_of(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "table.ResultsListTable")),
+                    _no_results_shown,
+                ))
+            except TimeoutException:
+                results_loaded = False
+                log.warning("⚠️  Results did not appear in time, parsing current page")
             
             # Parse results using the same driver instance
-            results = self.parse_search_results_isolated(driver, keyword, session_year)
+            page_source = driver.page_source
+            if results_loaded:
+                self._write_page_cache(keyword, session_year, page_source)
+            results = self.parse_search_results_isolated(page_source, keyword, session_year)
             
-            print(f"📊 Found {len(results)} results for '{keyword}'")
+            log.info("📊 Found %d results for '%s'", len(results), keyword)
             
-        except Exception as e:
-            print(f"❌ Error searching for keyword '{keyword}': {str(e)}")
+        except InvalidSessionIdException as e:
+            log.error("❌ Browser session died searching for '%s': %s", keyword, e)
+            self._quit_driver(driver)
+            driver = None  # Not returned to the pool; the next checkout starts a fresh one
             results = []
             
+        except Exception as e:
+            log.error("❌ Error searching for keyword '%s': %s", keyword, e)
+            results = []
+        
         finally:
-            # Always close the browser for this keyword
-            if driver:
-                try:
-                    driver.quit()
-                    print("🔄 Browser closed for this keyword")
-                except:
-                    pass
-            
-            # Wait between keywords
-            time.sleep(2)
+            if driver is not None:
+                self._checkin_driver(driver, uses + 1)
+        
+        return results
+    
+    def _page_cache_path(self, keyword, session_year):
+        """Cache file for a keyword's raw results page, scoped to today's date"""
+        key = hashlib.sha1(f"{keyword}|{session_year}|{date.today().isoformat()}".encode('utf-8')).hexdigest()
+        return os.path.join(self.script_dir, PAGE_CACHE_DIR, f"{key}.html")
+    
+    def _read_page_cache(self, keyword, session_year):
+        """Return a cached results page younger than the TTL, or None"""
+        path = self._page_cache_path(keyword, session_year)
+        try:
+            if time.time() - os.path.getmtime(path) < PAGE_CACHE_TTL_SECONDS:
+                with open(path, encoding='utf-8') as fp:
+                    return fp.read()
+        except OSError:
+            pass
+        return None
+    
+    def _prune_page_cache(self):
+        """Delete cached results pages older than the TTL, including previous days' keys"""
+        cache_dir = os.path.join(self.script_dir, PAGE_CACHE_DIR)
+        cutoff = time.time() - PAGE_CACHE_TTL_SECONDS
+        try:
+            with os.scandir(cache_dir) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+        except OSError:
+            pass
+    
+    def _write_page_cache(self, keyword, session_year, page_source):
+        """Atomically store a keyword's raw results page"""
+        path = self._page_cache_path(keyword, session_year)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as fp:
+                fp.write(page_source)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️  Could not cache results page for '{keyword}': {str(e)}")
+    
+    def _post_summary_search(self, driver, keyword):
+        """Submit a summary search with requests, reusing the browser's cookies and hidden form fields"""
+        form_state, doc = self._parse_postback_page(driver.page_source)
+        summary_input = doc.get_element_by_id(SUMMARY_INPUT_ID, None)
+        search_button = doc.get_element_by_id(SUMMARY_SEARCH_ID, None)
+        if summary_input is None or search_button is None:
+            raise Exception("Summary search form not found in browser page")
+        
+        data = {
+            **form_state,
+            summary_input.get('name') or SUMMARY_INPUT_ID.replace('_', '$'): keyword,
+            search_button.get('name') or SUMMARY_SEARCH_ID.replace('_', '$'): search_button.get('value', 'Search'),
+        }
+        cookies = {c['name']: c['value'] for c in driver.get_cookies()}
+        
+        resp = http_session.post(self.search_page_url, data=data, cookies=cookies, timeout=30)
+        resp.raise_for_status()
+        if any(marker in resp.text for marker in VIEWSTATE_ERROR_MARKERS):
+            raise Exception("Form state rejected by server")
+        return resp.text
+    
+    @staticmethod
+    def _parse_postback_page(html):
+        """Parse a page, returning its hidden ASP.NET form fields (__VIEWSTATE, __EVENTVALIDATION, ...) and the lxml document"""
+        doc = lxml.html.fromstring(html)
+        return {
+            field.get('name'): field.get('value', '')
+            for field in HIDDEN_INPUTS_XPATH(doc)
+        }, doc
+    
+    async def _prime_summary_form(self, session):
+        """GET the search page and post back the 'Search by Summary' tab once.
+        
+        Returns the hidden form state plus the summary input/button names, which
+        every keyword search can then reuse with a single POST.
+        """
+        async with session.get(self.search_page_url) as resp:
+            resp.raise_for_status()
+            form_state, doc = self._parse_postback_page(await resp.text())
+        
+        # The tab is either a submit input or a __doPostBack link button
+        tab = doc.get_element_by_id(SUMMARY_TAB_ID, None)
+        if tab is None:
+            raise Exception("'Search by Summary' control not found")
+        tab_name = tab.get('name') or SUMMARY_TAB_ID.replace('_', '$')
+        if tab.tag == 'input':
+            form_state[tab_name] = tab.get('value', '')
+        else:
+            form_state['__EVENTTARGET'] = tab_name
+            form_state['__EVENTARGUMENT'] = ''
+        
+        async with session.post(self.search_page_url, data=form_state) as resp:
+            resp.raise_for_status()
+            form_state, doc = self._parse_postback_page(await resp.text())
+        
+        summary_input = doc.get_element_by_id(SUMMARY_INPUT_ID, None)
+        search_button = doc.get_element_by_id(SUMMARY_SEARCH_ID, None)
+        if summary_input is None or search_button is None:
+            raise Exception("Summary search form not found after postback")
+        
+        return (
+            form_state,
+            summary_input.get('name') or SUMMARY_INPUT_ID.replace('_', '$'),
+            search_button.get('name') or SUMMARY_SEARCH_ID.replace('_', '$'),
+            search_button.get('value', 'Search'),
+        )
+    
+    async def _get_summary_form(self, session, stale=None):
+        """Return the cached summary form state, priming it if missing or if `stale` was rejected"""
+        async with self._form_lock:
+            if self._summary_form is None or self._summary_form is stale:
+                self._summary_form = await self._prime_summary_form(session)
+            return self._summary_form
+    
+    async def _fetch_keyword(self, session, keyword, session_year):
+        """POST one summary search and parse the results page"""
+        form = await self._get_summary_form(session)
+        
+        for attempt in range(2):
+            form_state, input_name, button_name, button_value = form
+            data = {**form_state, input_name: keyword, button_name: button_value}
+            
+            async with session.post(self.search_page_url, data=data) as resp:
+                page_source = await resp.text()
+                rejected = resp.status == 500 or any(marker in page_source for marker in VIEWSTATE_ERROR_MARKERS)
+                if not rejected:
+                    resp.raise_for_status()
+                    self._write_page_cache(keyword, session_year, page_source)
+                    break
+            
+            if attempt == 0:
+                # The server no longer accepts the cached view state, re-prime once
+                log.warning("⚠️  Cached form state rejected for '%s', re-priming", keyword)
+                form = await self._get_summary_form(session, stale=form)
+            else:
+                raise Exception(f"Summary search rejected for '{keyword}' (HTTP {resp.status})")
         
+        results = self.parse_search_results_isolated(page_source, keyword, session_year)
+        log.info("📊 Found %d results for '%s' (HTTP)", len(results), keyword)
         return results
     
-    def parse_search_results_isolated(self, driver, keyword, session_year):
-        """Parse search results using the provided driver instance"""
+    async def _search_keywords_http(self, keywords, session_year):
+        """Run every keyword search concurrently over one HTTP session.
+        
+        Returns one entry per keyword: its result list, or the exception raised.
+        """
+        connector = aiohttp.TCPConnector(limit=HTTP_CONCURRENCY, keepalive_timeout=30, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=60)
+        semaphore = asyncio.Semaphore(HTTP_CONCURRENCY)
+        
+        async def guarded(keyword):
+            async with semaphore:
+                return await self._fetch_keyword(session, keyword, session_year)
+        
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=HTTP_HEADERS) as session:
+            self._form_lock = asyncio.Lock()
+            self._summary_form = None  # Hidden fields are tied to this session's cookies
+            await self._get_summary_form(session)
+            return await asyncio.gather(
+                *[guarded(keyword) for keyword in keywords],
+                return_exceptions=True
+            )
+    
+    def parse_search_results_isolated(self, page_source, keyword, session_year):
+        """Parse search results from a results page's HTML"""
         results = []
         
         try:
-            current_url = driver.current_url
-            print(f"🌐 Parsing results from: {current_url}")
-            
-            # Get page source
-            page_source = driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
-            
-            # Check if we have results or "no results" message
-            page_text = soup.get_text().lower()
-            
-            if "no bills found" in page_text or "no results" in page_text or "no bills were found" in page_text:
-                print(f"📄 No bills found for keyword: '{keyword}'")
+            # Check for a "no results" message on the raw HTML before parsing
+            source_lower = page_source.lower()
+            if any(marker in source_lower for marker in NO_RESULTS_MARKERS):
+                log.debug("📄 No bills found for keyword: '%s'", keyword)
                 return []
             
-            # Look specifically for the ResultsListTable
-            results_table = soup.find('table', class_='ResultsListTable')
+            # Parse from the results table onwards, skipping the head and the large __VIEWSTATE field
+            marker = page_source.find('ResultsListTable')
+            table_start = page_source.rfind('<table', 0, marker) if marker != -1 else -1
+            results_table = None
+            if table_start != -1:
+                results_table = _first(_XP_RESULTS_TABLE, lxml.html.fromstring(page_source[table_start:]))
             
-            if not results_table:
-                print(f"❌ Could not find ResultsListTable for '{keyword}'")
+            if results_table is None:
+                log.warning("❌ Could not find ResultsListTable for '%s'", keyword)
                 return []
             
-            print("✅ Found ResultsListTable")
+            log.debug("✅ Found ResultsListTable")
             
             # Find all rows in the tbody
-            tbody = results_table.find('tbody')
-            if not tbody:
-                print("❌ Could not find tbody in ResultsListTable")
+            if results_table.find('tbody') is None:
+                log.warning("❌ Could not find tbody in ResultsListTable")
                 return []
             
-            rows = tbody.find_all('tr')
-            print(f"📋 Found {len(rows)} rows in ResultsListTable")
+            rows = _XP_ROWS(results_table)
+            extracted_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            log.debug("📋 Found %d rows in ResultsListTable", len(rows))
             
             # Process rows in pairs (bill info + summary)
-            i = 0
-            while i < len(rows):
-                bill_row = rows[i]
-                summary_row = rows[i + 1] if i + 1 < len(rows) else None
-                
-                # Check if this is a bill info row (has bill number link)
-                bill_link_elem = bill_row.find('a', href=lambda href: href and 'BillInfo.aspx' in href)
-                
-                if bill_link_elem:
-                    bill_data = self.extract_bill_data_from_result_rows(bill_row, summary_row, keyword, session_year)
+            debug = log.isEnabledFor(logging.DEBUG)  # Checked once, not per row
+            row_iter = iter(rows)
+            for bill_row in row_iter:
+                # Only bill info rows have a bill number link; the next row is its summary
+                if _XP_BILL_LINK(bill_row):
+                    summary_row = next(row_iter, None)
+                    bill_data = self.extract_bill_data_from_result_rows(bill_row, summary_row, keyword, session_year, extracted_at)
                     if bill_data:
                         results.append(bill_data)
-                        print(f"✅ Extracted: {bill_data['bill_number']} by {bill_data['sponsors']}")
-                    
-                    i += 2  # Skip summary row
-                else:
-                    i += 1  # Move to next row
+                        if debug:
+                            log.debug("✅ Extracted: %s by %s", bill_data.bill_number, bill_data.sponsors)
             
-            # Remove duplicates for this keyword
-            unique_results = []
-            seen_bills = set()
-            
-            for result in results:
-                bill_id = result['bill_number']
-                if bill_id not in seen_bills:
-                    unique_results.append(result)
-                    seen_bills.add(bill_id)
-            
-            return unique_results
+            return results
             
         except Exception as e:
-            print(f"❌ Error parsing results: {str(e)}")
+            log.error("❌ Error parsing results: %s", e)
             return []
     
-    def extract_bill_data_from_result_rows(self, bill_row, summary_row, keyword, session_year):
+    def extract_bill_data_from_result_rows(self, bill_row, summary_row, keyword, session_year, extracted_at):
         """Extract bill data from the structured ResultsListTable rows with enhanced sponsor extraction"""
         try:
             # Extract bill number and link
-            bill_link_elem = bill_row.find('a', href=lambda href: href and 'BillInfo.aspx' in href)
-            if not bill_link_elem:
+            bill_link_elem = _first(_XP_BILL_LINK, bill_row)
+            if bill_link_elem is None:
                 return None
             
-            bill_number = bill_link_elem.get_text(strip=True)
+            bill_number = _leaf_text(bill_link_elem)
             bill_href = bill_link_elem.get('href', '')
             
-            # Create full bill link
-            if bill_href.startswith('/'):
-                bill_link = f"{self.base_url}{bill_href}"
-            elif bill_href.startswith('http'):
-                bill_link = bill_href
-            else:
-                bill_link = f"{self.base_url}/Legis/{bill_href}"
+            # Create full bill link (absolute, root-relative or relative to /Legis/)
+            bill_link = urljoin(self.bill_base_url, bill_href)
             
-            # Enhanced sponsor extraction with multiple fallback methods
-            sponsors = self.extract_sponsors_enhanced(bill_row)
+            # Enhanced sponsor extraction with multiple fallback methods, once per bill
+            # Keyed by session too - bill numbers like "HB1" repeat every session
+            sponsor_key = (session_year, bill_number)
+            with self._sponsor_lock:
+                sponsors = self._sponsor_cache.get(sponsor_key)
+            if sponsors is None:
+                sponsors = self.extract_sponsors_enhanced(bill_row)
+                with self._sponsor_lock:
+                    sponsors = self._sponsor_cache.setdefault(sponsor_key, sponsors)
             
             # Extract current status
-            status_elem = bill_row.find('span', id=lambda x: x and 'LabelStatus' in x)
-            last_action = status_elem.get_text(strip=True) if status_elem else 'Unknown'
+            status_elem = _first(_XP_STATUS, bill_row)
+            last_action = _leaf_text(status_elem) if status_elem is not None else 'Unknown'
             
             # Extract title and summary from summary row
             title = ""
             summary = ""
             
-            if summary_row:
-                summary_elem = summary_row.find('span', id=lambda x: x and 'LabelKWordAndSTitle' in x)
-                if summary_elem:
-                    full_summary = summary_elem.get_text(strip=True)
+            if summary_row is not None:
+                summary_elem = _first(_XP_SUMMARY, summary_row)
+                if summary_elem is not None:
+                    full_summary = _stripped_text(summary_elem)
                     
                     if ':' in full_summary:
                         parts = full_summary.split(':', 1)
@@ -272,71 +627,71 @@ class LouisianaBillScraper:
             if not summary:
                 summary = title
             
-            bill_data = {
-                'year': session_year,
-                'state': 'Louisiana',
-                'bill_number': bill_number,
-                'bill_title': title,
-                'summary': summary,
-                'sponsors': sponsors,
-                'last_action': last_action,
-                'bill_link': bill_link,
-                'extracted_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'matched_keyword': keyword
-            }
+            bill_data = BillRecord(
+                year=session_year,
+                state='Louisiana',
+                bill_number=bill_number,
+                bill_title=title,
+                summary=summary,
+                sponsors=sponsors,
+                last_action=last_action,
+                bill_link=bill_link,
+                extracted_date=extracted_at,
+                matched_keyword=keyword
+            )
             
             return bill_data
             
         except Exception as e:
-            print(f"❌ Error extracting bill data from rows: {str(e)}")
+            log.debug("❌ Error extracting bill data from rows: %s", e)
             return None
     
     def extract_sponsors_enhanced(self, bill_row):
         """Enhanced sponsor extraction with multiple fallback methods"""
         try:
+            # Methods 1 and 2 share a single walk over the row's candidate author links
+            author_links = _XP_AUTHOR_LINKS(bill_row)
+            
             # Method 1: Look for standard senate/house.la.gov links
-            author_elem = bill_row.find('a', href=lambda href: href and ('senate.la.gov' in href or 'house.la.gov' in href))
-            if author_elem:
-                sponsor_name = author_elem.get_text(strip=True)
-                if sponsor_name and sponsor_name.upper() not in ['', 'UNKNOWN']:
+            author_elem = next((a for a in author_links if _is_legis_href(a.get('href', ''))), None)
+            if author_elem is not None:
+                sponsor_name = _leaf_text(author_elem)
+                if sponsor_name and sponsor_name.upper() not in _UNKNOWN_NAMES:
                     return sponsor_name
             
             # Method 2: Look for LinkAuthor control ID pattern
-            author_link_by_id = bill_row.find('a', id=lambda x: x and 'LinkAuthor' in x)
-            if author_link_by_id:
-                author_text = author_link_by_id.get_text(strip=True)
+            author_link_by_id = next((a for a in author_links if 'LinkAuthor' in a.get('id', '')), None)
+            if author_link_by_id is not None:
+                author_text = _leaf_text(author_link_by_id)
                 if author_text and len(author_text) > 2:
                     return author_text
             
             # Method 3: Look in specific table cells (second column typically has author)
-            cells = bill_row.find_all(['td', 'th'])
+            cells = _XP_CELLS(bill_row)
             if len(cells) >= 2:
                 author_cell = cells[1]
                 
                 # First try to find a link in the author cell
-                author_link = author_cell.find('a')
-                if author_link:
-                    author_text = author_link.get_text(strip=True)
-                    if author_text and len(author_text) > 2 and author_text.upper() not in ['UNKNOWN', '']:
+                author_link = author_cell.find('.//a')
+                if author_link is not None:
+                    author_text = _leaf_text(author_link)
+                    if author_text and len(author_text) > 2 and author_text.upper() not in _UNKNOWN_NAMES:
                         return author_text
                 
                 # If no link, try to extract text directly from the cell
-                cell_text = author_cell.get_text(strip=True)
+                cell_text = _stripped_text(author_cell)
                 cell_text = ' '.join(cell_text.split())
                 
                 if cell_text and len(cell_text) > 2 and len(cell_text) < 50:
-                    exclude_patterns = ['more...', 'billinfo', 'considered', 'status', 'current']
-                    if not any(pattern.lower() in cell_text.lower() for pattern in exclude_patterns):
+                    cell_lower = cell_text.lower()
+                    if not any(pattern in cell_lower for pattern in _EXCLUDE_CELL_PATTERNS):
                         return cell_text
             
             # Method 4: Pattern matching for author names
-            row_text = bill_row.get_text()
-            author_pattern = r'\b[A-Z]{3,15}\b'
-            matches = re.findall(author_pattern, row_text)
+            row_text = ''.join(_XP_TEXT(bill_row))
             
-            for match in matches:
-                exclude_words = ['BILL', 'ACT', 'HOUSE', 'SENATE', 'MORE', 'CURRENT', 'STATUS', 'SIGNED', 'PASSED', 'GOVERNOR', 'PRESIDENT']
-                if match not in exclude_words and len(match) >= 4:
+            for match in _AUTHOR_RE.findall(row_text):
+                if match not in _EXCLUDE_WORDS and len(match) >= 4:
                     return match
             
             return 'Unknown'
@@ -344,54 +699,150 @@ class LouisianaBillScraper:
         except Exception as e:
             return 'Unknown'
     
+    def _checkpoint_path(self, session_year):
+        """Path of the append-only per-keyword results checkpoint for a session"""
+        return os.path.join(self.script_dir, CHECKPOINT_FILE.format(session_year=session_year))
+    
+    def load_checkpoint(self, session_year):
+        """Load results checkpointed by an interrupted run, grouped by matched keyword"""
+        completed = {}
+        path = self._checkpoint_path(session_year)
+        if os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as fp:
+                    for line in fp:
+                        try:
+                            record = BillRecord(**json.loads(line))
+                        except (ValueError, TypeError):
+                            continue  # Partial last line from a crash
+                        completed.setdefault(record.matched_keyword, []).append(record)
+            except Exception as e:
+                print(f"⚠️  Could not read checkpoint {path}: {str(e)}")
+        if completed:
+            print(f"♻️  Resuming {session_year}: {len(completed)} keywords already searched")
+        return completed
+    
+    def retire_checkpoint(self, session_year):
+        """Retire the checkpoint once its results have been saved"""
+        path = self._checkpoint_path(session_year)
+        if os.path.exists(path):
+            os.replace(path, path.replace('.jsonl', '.done'))
+    
     def search_all_keywords(self, keywords=None, session_year="2025"):
-        """Search for all keywords using isolated browser sessions"""
+        """Search for all keywords over HTTP, falling back to a pool of browser workers"""
         if keywords is None:
             keywords = KEYWORDS
         
-        all_results = []
+        merged = {}  # (bill_number, year) -> first result seen; the only dedup pass
+        total_results = 0
         successful_searches = 0
         
         print(f"🚀 Starting search for {len(keywords)} keywords in {session_year}")
         print("=" * 70)
         
-        for idx, keyword in enumerate(keywords, 1):
-            print(f"\n[{idx}/{len(keywords)}] Processing: '{keyword}'")
-            print("-" * 50)
-            
+        # Keywords checkpointed by an interrupted run are not searched again
+        completed = self.load_checkpoint(session_year)
+        pending = [k for k in keywords if k not in completed]
+        
+        # Longer keywords that contain a shorter one can be answered from its results
+        derived = _derivable_keywords(pending, keywords) if DERIVE_LONGER_KEYWORDS else {}
+        if derived:
+            print(f"✂️  Deriving {len(derived)} keyword(s) from shorter keyword results")
+            pending = [k for k in pending if k not in derived]
+        
+        # Results pages fetched recently are parsed from disk unless refreshing
+        self._prune_page_cache()
+        cached_results = {}
+        if not self.refresh:
+            for keyword in pending:
+                page_source = self._read_page_cache(keyword, session_year)
+                if page_source is not None:
+                    print(f"💾 Using cached results page for '{keyword}'")
+                    cached_results[keyword] = self.parse_search_results_isolated(page_source, keyword, session_year)
+            pending = [k for k in pending if k not in cached_results]
+        
+        # Fast path: all keywords concurrently over plain HTTP postbacks
+        http_results = []
+        if pending:
             try:
-                results = self.search_single_keyword_isolated(keyword, session_year)
-                
-                if results:
-                    all_results.extend(results)
-                    successful_searches += 1
-                    print(f"✅ Found {len(results)} bills for '{keyword}'")
-                else:
-                    print(f"📄 No results for '{keyword}'")
-                
-                if idx < len(keywords):
-                    print("⏳ Waiting 3 seconds before next keyword...")
-                    time.sleep(3)
-                    
+                http_results = asyncio.run(self._search_keywords_http(pending, session_year))
             except Exception as e:
-                print(f"❌ Critical error for '{keyword}': {str(e)}")
-                continue
+                print(f"⚠️  HTTP search unavailable, using browser for all keywords: {str(e)}")
+                http_results = [e] * len(pending)
+        search_results = dict(zip(pending, http_results))
+        search_results.update(cached_results)
         
-        # Remove duplicates across all keywords
-        unique_results = []
-        seen_bills = set()
+        # Fallback: keywords whose HTTP search failed run on a bounded thread pool,
+        # each task checking a browser out of the shared driver pool
+        fallback_keywords = [k for k, r in search_results.items() if isinstance(r, Exception)]
+        browser_results = {}
+        if fallback_keywords and not self.browser_fallback:
+            print(f"⚠️  Browser fallback disabled, {len(fallback_keywords)} keyword(s) failed over HTTP")
+        elif fallback_keywords:
+            print(f"⚠️  Falling back to browser for {len(fallback_keywords)} keyword(s)")
+            try:
+                workers = min(BROWSER_WORKERS, len(fallback_keywords))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = {
+                        executor.submit(self.search_single_keyword_isolated, keyword, session_year): keyword
+                        for keyword in fallback_keywords
+                    }
+                    for done, future in enumerate(as_completed(futures), 1):
+                        keyword = futures[future]
+                        browser_results[keyword] = future.result()
+                        print(f"🌐 Browser search {done}/{len(futures)} finished: '{keyword}'")
+            finally:
+                self._close_all_drivers()
         
-        for result in all_results:
-            bill_key = f"{result['bill_number']}_{result['year']}"
-            if bill_key not in seen_bills:
-                unique_results.append(result)
-                seen_bills.add(bill_key)
+        keyword_results = {}
+        for keyword, results in search_results.items():
+            keyword_results[keyword] = browser_results.get(keyword, []) if isinstance(results, Exception) else results
+        for keyword, root in derived.items():
+            root_results = completed.get(root) or keyword_results.get(root, [])
+            keyword_lower = keyword.lower()
+            keyword_results[keyword] = [
+                replace(r, matched_keyword=keyword) for r in root_results
+                if keyword_lower in f"{r.bill_title} {r.summary}".lower()
+            ]
+        
+        with open(self._checkpoint_path(session_year), 'a', encoding='utf-8') as ckpt:
+            for idx, keyword in enumerate(keywords, 1):
+                print(f"\n[{idx}/{len(keywords)}] Processing: '{keyword}'")
+                print("-" * 50)
+                
+                try:
+                    if keyword in completed:
+                        results = completed[keyword]
+                        print(f"♻️  Loaded {len(results)} bills for '{keyword}' from checkpoint")
+                    else:
+                        results = keyword_results[keyword]
+                        
+                        if results:
+                            # Durably record this keyword before moving on
+                            ckpt.write(''.join(json.dumps(asdict(r)) + '\n' for r in results))
+                            ckpt.flush()
+                            os.fsync(ckpt.fileno())
+                    
+                    if results:
+                        for result in results:
+                            merged.setdefault((result.bill_number, result.year), result)
+                        total_results += len(results)
+                        successful_searches += 1
+                        print(f"✅ Found {len(results)} bills for '{keyword}'")
+                    else:
+                        print(f"📄 No results for '{keyword}'")
+                    
+                except Exception as e:
+                    print(f"❌ Critical error for '{keyword}': {str(e)}")
+                    continue
+        
+        unique_results = list(merged.values())
         
         print(f"\n📊 FINAL RESULTS:")
         print("=" * 70)
         print(f"Keywords processed: {len(keywords)}")
         print(f"Successful searches: {successful_searches}")
-        print(f"Total results found: {len(all_results)}")
+        print(f"Total results found: {total_results}")
         print(f"Unique bills found: {len(unique_results)}")
         
         return unique_results
@@ -410,11 +861,15 @@ class LouisianaBillScraper:
         full_path = os.path.join(self.script_dir, filename)
         
         try:
-            # Create DataFrame
-            df = pd.DataFrame(results)
-            
-            # Save to Excel
-            df.to_excel(full_path, index=False)
+            # Stream rows straight to the sheet; constant_memory keeps one row resident
+            workbook = xlsxwriter.Workbook(full_path, {'constant_memory': True})
+            try:
+                worksheet = workbook.add_worksheet()
+                worksheet.write_row(0, 0, BILL_RECORD_COLUMNS, workbook.add_format({'bold': True}))
+                for row_idx, record in enumerate(results, 1):
+                    worksheet.write_row(row_idx, 0, _BILL_RECORD_FIELDS(record))
+            finally:
+                workbook.close()
             
             print(f"✅ Results saved to: {full_path}")
             print(f"📊 Saved {len(results)} bills to Excel")
@@ -429,11 +884,18 @@ class LouisianaBillScraper:
         """Setup logging in the same directory as the script"""
         log_filename = os.path.join(self.script_dir, f"scraper_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
         
+        log_format = '%(asctime)s - %(levelname)s - %(message)s'
+        
+        # Buffer file writes; records are flushed every 100 entries, on errors, and at exit
+        file_handler = logging.FileHandler(log_filename)
+        file_handler.setFormatter(logging.Formatter(log_format))
+        buffered_file_handler = logging.handlers.MemoryHandler(100, flushLevel=logging.ERROR, target=file_handler)
+        
         logging.basicConfig(
             level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
+            format=log_format,
             handlers=[
-                logging.FileHandler(log_filename),
+                buffered_file_handler,
                 logging.StreamHandler(sys.stdout)
             ]
         )
@@ -442,7 +904,14 @@ class LouisianaBillScraper:
 
 def main():
     """Main execution function"""
-    scraper = LouisianaBillScraper()
+    parser = argparse.ArgumentParser(description="Louisiana Legislative Bill Scraper")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Ignore cached results pages and search the site again")
+    parser.add_argument("--no-browser", action="store_true",
+                        help="Do not retry failed HTTP searches in headless Chrome")
+    args = parser.parse_args()
+    
+    scraper = LouisianaBillScraper(refresh=args.refresh, browser_fallback=not args.no_browser)
     log_file = scraper.setup_logging()
     logger = logging.getLogger(__name__)
     
@@ -463,25 +932,26 @@ def main():
             excel_file = scraper.save_to_excel(results_2025)
             
             if excel_file:
+                scraper.retire_checkpoint("2025")
                 logger.info("🎉 SUCCESS!")
                 logger.info(f"📊 Found {len(results_2025)} unique healthcare-related bills")
                 logger.info(f"💾 Data saved to: {excel_file}")
                 
                 # Show sponsor extraction summary
-                sponsors_found = [r['sponsors'] for r in results_2025 if r['sponsors'] != 'Unknown']
-                unknown_count = len([r for r in results_2025 if r['sponsors'] == 'Unknown'])
+                sponsors_found = sum(1 for r in results_2025 if r.sponsors != 'Unknown')
+                unknown_count = len(results_2025) - sponsors_found
                 
-                if sponsors_found or unknown_count:
-                    success_rate = len(sponsors_found)/(len(sponsors_found)+unknown_count)*100
+                if results_2025:
+                    success_rate = sponsors_found / len(results_2025) * 100
                     logger.info(f"\n📊 SPONSOR EXTRACTION SUMMARY:")
-                    logger.info(f"   - Found sponsors: {len(sponsors_found)}")
+                    logger.info(f"   - Found sponsors: {sponsors_found}")
                     logger.info(f"   - Unknown sponsors: {unknown_count}")
                     logger.info(f"   - Success rate: {success_rate:.1f}%")
                 
                 # Print summary
                 logger.info("\n📋 BILL SUMMARY:")
                 for result in results_2025:
-                    logger.info(f"  • {result['bill_number']} - {result['sponsors']} - '{result['matched_keyword']}'")
+                    logger.info(f"  • {result.bill_number} - {result.sponsors} - '{result.matched_keyword}'")
                     
             else:
                 logger.error("❌ Failed to save results to Excel")
@@ -71,7 +71,7 @@ def main():
                 # Print summary
                 logger.info("\n📋 BILL SUMMARY:")
                 for result in all_results:
-                    logger.info(f"  • {result['bill_number']} - {result['sponsors']} - '{result['matched_keyword']}'")
+                    logger.info(f"  • {result.bill_number} - {result.sponsors} - '{result.matched_keyword}'")
             else:
                 logger.error("❌ Failed to save results to Excel")
         else:
@@ -1,5 +1,13 @@
 """
 Scheduler for Louisiana Bill Scraper - Bi-weekly execution
+
+For production, prefer the systemd units in deploy/ (scraper.service + scraper.timer),
+which start main.py only when due instead of keeping this process resident:
+
+    sudo cp deploy/scraper.service deploy/scraper.timer /etc/systemd/system/
+    sudo systemctl enable --now scraper.timer
+
+This polling scheduler remains as a fallback for machines without systemd.
 """
 
 import schedule
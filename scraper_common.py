@@ -0,0 +1,54 @@
+"""
+Helpers shared by the state scrapers
+"""
+
+import xlsxwriter
+
+# Analytics, ads, fonts and images - never needed for text extraction, so dropped before they hit
+# the network. CSS is kept so JS-rendered tables report their text the same way.
+BLOCKED_URL_PATTERNS = [
+    '*google-analytics*', '*googletagmanager*', '*doubleclick*',
+    '*.woff*', '*.ttf', '*.png', '*.jpg', '*.gif', '*.svg',
+]
+
+def block_heavy_resources(driver):
+    """Block BLOCKED_URL_PATTERNS on a Chrome driver through the DevTools Protocol"""
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+    except Exception as e:
+        print(f"⚠️  Could not enable resource blocking: {e}")
+
+def bill_key(bill):
+    """(Year, Bill Number) merge key as strings - Years read back from Excel come in as ints"""
+    return str(bill['Year']), str(bill['Bill Number'])
+
+def write_rows_xlsx(filepath, columns, rows):
+    """Write a bold header and then rows (sequences in columns order) to filepath.
+    
+    Rows are streamed through xlsxwriter's constant_memory mode, which keeps only the
+    current row in memory - so they must arrive whole and in order. Returns the row count.
+    """
+    workbook = xlsxwriter.Workbook(filepath, {'constant_memory': True})
+    try:
+        worksheet = workbook.add_worksheet()
+        worksheet.write_row(0, 0, columns, workbook.add_format({'bold': True}))
+        row_idx = 0
+        for row_idx, row in enumerate(rows, 1):
+            worksheet.write_row(row_idx, 0, row)
+    finally:
+        workbook.close()
+    return row_idx
+
+def save_bills_xlsx(existing_df, new_bills, filepath):
+    """Merge new bills over the existing rows on bill_key and write them sorted to filepath.
+    
+    Returns the number of rows written.
+    """
+    records = {bill_key(bill): bill for bill in existing_df.fillna('').to_dict('records')}
+    records.update((bill_key(bill), bill) for bill in new_bills)
+    
+    columns = list(new_bills[0].keys())
+    return write_rows_xlsx(
+        filepath, columns, ([records[key].get(column, '') for column in columns] for key in sorted(records))
+    )
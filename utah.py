@@ -9,11 +9,25 @@ import pandas as pd
 from datetime import datetime
 import os
 import re
+import json
+import functools
+import ahocorasick
+import requests
+from requests.adapters import HTTPAdapter
+import lxml.html
+import urllib.parse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from scraper_common import bill_key, block_heavy_resources, save_bills_xlsx
 
 # Configuration
 STATE = "Utah"
 SESSIONS = ["2025", "2026"]
 OUTPUT_FILE = "Utah_Bills_Filtered_Selenium.xlsx"
+DETAIL_WORKERS = 10  # Concurrent HTTP fetches of matched bill pages
+CONTENT_WAIT_SECONDS = 2  # Tab content that may be absent (no <gd>/<hp>, no status rows) is only waited for this long
+MIN_REQUEST_INTERVAL = 0.3  # Politeness: minimum spacing between detail page requests
+LISTING_STATE_FILE = ".utah_listing_state.json"  # Listing fingerprint of every bill already in OUTPUT_FILE
 
 # Same keywords as other scrapers - exact phrase match (case-insensitive) in Title
 KEYWORDS = [
@@ -32,6 +46,11 @@ KEYWORDS = [
     'automate decision support',
 ]
 
+# Pooled HTTP session for bill detail pages that are server-rendered
+http_session = requests.Session()
+http_session.headers.update({'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'})
+http_session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=10))
+
 # Chrome Options for headless browsing
 chrome_options = Options()
 chrome_options.add_argument("--headless")  # Remove this line if you want to see the browser
@@ -39,19 +58,38 @@ chrome_options.add_argument("--window-size=1920,1080")
 chrome_options.add_argument("--disable-gpu")
 chrome_options.add_argument("--no-sandbox")
 chrome_options.add_argument("--disable-dev-shm-usage")
+chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+chrome_options.add_argument("--disable-extensions")
+chrome_options.add_argument("--disable-background-networking")
+chrome_options.add_experimental_option("prefs", {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.default_content_setting_values.notifications": 2,
+})
+
+# Keyword matching - one Aho-Corasick automaton scans a title for all keywords in a single pass
+_WS_RE = re.compile(r'\s+')
+_LINE_NUMBER_RE = re.compile(r'\b\d+\b')
+_LEADING_NUMBER_RE = re.compile(r'\d+\s+')
+_KEYWORD_AUTOMATON = ahocorasick.Automaton()
+for _keyword in KEYWORDS:
+    _KEYWORD_AUTOMATON.add_word(_keyword.lower(), _keyword)
+_KEYWORD_AUTOMATON.make_automaton()
 
+@functools.lru_cache(maxsize=4096)
 def normalize_text(text):
-    """Normalize text for keyword matching"""
+    """Normalize text for keyword matching (memoized - the same title can be re-examined)"""
     if not text:
         return ""
-    return re.sub(r'\s+', ' ', text).strip().lower()
+    return _WS_RE.sub(' ', text).strip().lower()
 
-def contains_keyword(text, keywords):
+def cell_text(elem):
+    """Visible-style text of a parsed table cell, with whitespace collapsed"""
+    return _WS_RE.sub(' ', elem.text_content()).strip()
+
+def contains_keyword(text):
     """Check if text contains any of the keywords as exact phrases (case-insensitive)"""
-    text_norm = normalize_text(text)
-    for keyword in keywords:
-        if keyword.lower() in text_norm:
-            return True, keyword
+    for _, keyword in _KEYWORD_AUTOMATON.iter(normalize_text(text)):
+        return True, keyword
     return False, None
 
 def safe_click_element(driver, element_locator, wait_time=10):
@@ -76,6 +114,14 @@ def safe_click_element(driver, element_locator, wait_time=10):
             return False
     return False
 
+def wait_for_element(driver, element_locator, wait_time=10):
+    """Wait until an element is present instead of sleeping a fixed time; returns False on timeout"""
+    try:
+        WebDriverWait(driver, wait_time).until(EC.presence_of_element_located(element_locator))
+        return True
+    except TimeoutException:
+        return False
+
 def safe_get_text(driver, element_locator, wait_time=5):
     """Safely get text from elements with retry logic"""
     max_retries = 3
@@ -96,6 +142,85 @@ def safe_get_text(driver, element_locator, wait_time=5):
             return []
     return []
 
+def build_summary(gd_texts, hp_texts):
+    """Build a bill summary from General Description (<gd>) and Highlighted Provisions (<hp>) texts"""
+    summary_parts = []
+    
+    for text in gd_texts:
+        # Clean up line numbers and extra whitespace
+        cleaned = _LINE_NUMBER_RE.sub('', text)
+        cleaned = _WS_RE.sub(' ', cleaned).strip()
+        if len(cleaned) > 50:  # Only substantial content
+            summary_parts.append(cleaned)
+    
+    for text in hp_texts:
+        cleaned = _LEADING_NUMBER_RE.sub('', text)  # Remove line numbers
+        cleaned = cleaned.replace('▸', '•')  # Replace bullets
+        if len(cleaned) > 50:
+            summary_parts.append("Highlighted Provisions: " + cleaned)
+    
+    # Take first 2 substantial parts
+    return _WS_RE.sub(' ', ' '.join(summary_parts[:2])).strip()
+
+_throttle_lock = threading.Lock()
+_next_request_at = 0.0
+
+def throttle():
+    """Block until the next politeness slot; shared by all detail fetch threads"""
+    global _next_request_at
+    with _throttle_lock:
+        now = time.monotonic()
+        slot = max(now, _next_request_at)
+        _next_request_at = slot + MIN_REQUEST_INTERVAL
+    time.sleep(slot - now)
+
+def extract_bill_details_http(bill_url):
+    """Fetch a bill page over HTTP and extract summary and last action with lxml.
+    
+    Returns None when the bill status table is not in the server HTML,
+    so the caller can fall back to Selenium.
+    """
+    try:
+        throttle()
+        response = http_session.get(bill_url, timeout=30)
+        response.raise_for_status()
+        tree = lxml.html.fromstring(response.content)
+    except Exception as e:
+        print(f"    HTTP fetch failed, falling back to Selenium: {e}")
+        return None
+    
+    gd_texts = [elem.text_content() for elem in tree.iter('gd')]
+    hp_texts = [elem.text_content() for elem in tree.iter('hp')]
+    
+    # Most recent action is the last status row with both a date and an action - only the
+    # Status tab's tables are read, so other page tables can't leak into last_action
+    last_action = ""
+    for table in tree.xpath('//*[@id="billStatus"]//table'):
+        table_text = table.text_content().lower()
+        if 'action' in table_text or 'status' in table_text or 'date' in table_text:
+            for row in reversed(table.xpath('.//tr')[1:]):
+                cols = row.xpath('./td')
+                if len(cols) >= 2:
+                    date_text = cols[0].text_content().strip()
+                    action_text = cols[1].text_content().strip()
+                    if date_text and action_text:
+                        last_action = f"{date_text} {action_text}".strip()
+                        break
+            if last_action:
+                break
+    
+    # The status table is often rendered by JS - without it the last action would silently
+    # degrade to the governor's action, so let the browser read the Status tab instead
+    if not last_action:
+        return None
+    
+    summary = build_summary(gd_texts, hp_texts)
+    if not summary:
+        title = tree.xpath('//*[@id="pagetitle"]')
+        summary = title[0].text_content().strip() if title else "Summary not available"
+    
+    return summary, last_action
+
 def extract_bill_details_selenium(driver, bill_url):
     """Visit individual bill page using Selenium and extract summary and last action from tabs"""
     try:
@@ -106,40 +231,19 @@ def extract_bill_details_selenium(driver, bill_url):
         print(f"  Extracting details from: {bill_url}")
         driver.get(bill_url)
         
-        # Wait for page to load completely
-        time.sleep(3)
-        
         # Extract Summary from Bill Text tab
         summary = ""
         try:
             # Click on Bill Text tab (should be active by default, but ensure it's clicked)
+            # safe_click_element waits for the tab itself, so no fixed page-load sleep is needed
             if safe_click_element(driver, (By.ID, "activator-billText")):
-                time.sleep(2)  # Wait for content to load
-                
-                # Look for bill text content - try multiple approaches
-                summary_parts = []
-                
-                # Method 1: Look for <gd> elements (General Description)
-                gd_texts = safe_get_text(driver, (By.TAG_NAME, "gd"))
-                for text in gd_texts:
-                    # Clean up line numbers and extra whitespace
-                    cleaned = re.sub(r'\b\d+\b', '', text)
-                    cleaned = re.sub(r'\s+', ' ', cleaned).strip()
-                    if len(cleaned) > 50:  # Only substantial content
-                        summary_parts.append(cleaned)
-                
-                # Method 2: Look for <hp> elements (Highlighted Provisions)
-                hp_texts = safe_get_text(driver, (By.TAG_NAME, "hp"))
-                for text in hp_texts:
-                    cleaned = re.sub(r'\d+\s+', '', text)  # Remove line numbers
-                    cleaned = re.sub(r'▸', '•', cleaned)  # Replace bullets
-                    if len(cleaned) > 50:
-                        summary_parts.append("Highlighted Provisions: " + cleaned)
-                
-                # Combine summary parts
-                if summary_parts:
-                    summary = ' '.join(summary_parts[:2])  # Take first 2 substantial parts
-                    summary = re.sub(r'\s+', ' ', summary).strip()
+                # Not every bill has <gd>/<hp>, so only wait briefly for them (the old fixed sleep's length)
+                if wait_for_element(driver, (By.CSS_SELECTOR, "gd, hp"), CONTENT_WAIT_SECONDS):
+                    # Look for <gd> (General Description) and <hp> (Highlighted Provisions) elements -
+                    # the text has loaded, so a missing tag is not waited for again
+                    gd_texts = safe_get_text(driver, (By.TAG_NAME, "gd"), wait_time=0)
+                    hp_texts = safe_get_text(driver, (By.TAG_NAME, "hp"), wait_time=0)
+                    summary = build_summary(gd_texts, hp_texts)
             
         except Exception as e:
             print(f"    Error extracting summary: {e}")
@@ -148,8 +252,9 @@ def extract_bill_details_selenium(driver, bill_url):
         last_action = ""
         try:
             # Click on Status tab
-            if safe_click_element(driver, (By.ID, "activator-billStatus")):
-                time.sleep(2)  # Wait for status content to load
+            # Bills without a status table skip the scan after a short wait instead of a full timeout
+            if safe_click_element(driver, (By.ID, "activator-billStatus")) and \
+                    wait_for_element(driver, (By.CSS_SELECTOR, "#billStatus td"), CONTENT_WAIT_SECONDS):
                 
                 # Look for status table with retry logic
                 max_retries = 3
@@ -202,19 +307,38 @@ def extract_bill_details_selenium(driver, bill_url):
         print(f"    Error extracting bill details: {e}")
         return "", ""
 
-def scrape_bills_for_year_selenium(year, keywords):
-    """Scrape all bills for a given year from Utah legislature using Selenium"""
-    print(f"Scraping Utah bills for session {year}...")
+def listing_fingerprint(bill_data):
+    """Listing columns that change when a passed bill moves on (governor action, chapter, effective date)"""
+    return '|'.join(bill_data[field] for field in ('gov_action', 'gov_action_date', 'chapter', 'effective_date'))
+
+def load_listing_state(filepath=LISTING_STATE_FILE):
+    """Load the listing fingerprints saved by the previous run"""
+    try:
+        with open(filepath, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_listing_state(listing_state, filepath=LISTING_STATE_FILE):
+    """Persist listing fingerprints for the next run's delta check"""
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(listing_state, f)
+
+def scrape_bills_for_year_selenium(driver, year, previous_records=None, listing_state=None):
+    """Scrape all bills for a given year from Utah legislature using Selenium.
     
-    # Initialize WebDriver for this session
-    driver = webdriver.Chrome(options=chrome_options)
+    Bills already in the output whose listing fingerprint is unchanged since the last
+    run reuse their previous record instead of refetching the detail page.
+    """
+    previous_records = previous_records if previous_records is not None else {}
+    listing_state = listing_state if listing_state is not None else {}
+    print(f"Scraping Utah bills for session {year}...")
     
     try:
         base_url = f"https://le.utah.gov/asp/passedbills/passedbills.asp"
         params_url = f"{base_url}?session={year}GS"
         
         driver.get(params_url)
-        time.sleep(3)  # Wait for page to load
         
         # Find the main table with ID 'passedTbl'
         wait = WebDriverWait(driver, 10)
@@ -228,26 +352,27 @@ def scrape_bills_for_year_selenium(year, keywords):
         bill_data_list = []
         
         try:
-            rows = main_table.find_elements(By.TAG_NAME, "tr")[1:]  # Skip header
+            # Pull the whole table over in one call and parse it locally, instead of a round-trip per cell
+            table = lxml.html.fromstring(main_table.get_attribute('outerHTML'))
+            rows = table.xpath('.//tr')[1:]  # Skip header
             print(f"Found {len(rows)} bills for year {year}")
             
             for i, row in enumerate(rows):
                 try:
-                    cells = row.find_elements(By.TAG_NAME, "td")
+                    cells = row.xpath('./td')
                     if len(cells) >= 8:
-                        # Extract all data immediately to avoid stale references
-                        bill_link_element = cells[0].find_element(By.TAG_NAME, "a")
+                        bill_link_element = cells[0].xpath('.//a')[0]
                         bill_data = {
                             'index': i,
-                            'bill_number': bill_link_element.text.strip(),
-                            'bill_detail_url': bill_link_element.get_attribute("href"),
-                            'bill_title': cells[1].text.strip(),
-                            'sponsors': cells[2].text.strip(),
-                            'date_passed': cells[3].text.strip(),
-                            'effective_date': cells[4].text.strip(),
-                            'gov_action': cells[5].text.strip(),
-                            'gov_action_date': cells[6].text.strip(),
-                            'chapter': cells[7].text.strip()
+                            'bill_number': cell_text(bill_link_element),
+                            'bill_detail_url': urllib.parse.urljoin(params_url, bill_link_element.get('href', '')),
+                            'bill_title': cell_text(cells[1]),
+                            'sponsors': cell_text(cells[2]),
+                            'date_passed': cell_text(cells[3]),
+                            'effective_date': cell_text(cells[4]),
+                            'gov_action': cell_text(cells[5]),
+                            'gov_action_date': cell_text(cells[6]),
+                            'chapter': cell_text(cells[7])
                         }
                         bill_data_list.append(bill_data)
                 except Exception as e:
@@ -258,48 +383,74 @@ def scrape_bills_for_year_selenium(year, keywords):
             print(f"Error processing table rows: {e}")
             return []
         
-        # Now process each bill for keyword matching
+        # Filter by keywords in bill title (exact phrase match, case-insensitive)
+        matched_bills = []
+        for bill_data in bill_data_list:
+            has_keyword, matched_keyword = contains_keyword(bill_data['bill_title'])
+            if has_keyword:
+                print(f"Found matching bill: {bill_data['bill_number']} - {matched_keyword} - {bill_data['bill_title'][:50]}...")
+                matched_bills.append(bill_data)
+        
+        # Delta check - unchanged bills already in the output keep their previous record
         all_bills = []
         bills_found_matching_keywords = 0
+        changed_bills = []
+        for bill_data in matched_bills:
+            key = f"{year}|{bill_data['bill_number']}"
+            previous = previous_records.get((str(year), bill_data['bill_number']))
+            if previous and listing_state.get(key) == listing_fingerprint(bill_data):
+                all_bills.append(previous)
+                bills_found_matching_keywords += 1
+            else:
+                changed_bills.append(bill_data)
+        if len(changed_bills) < len(matched_bills):
+            print(f"Reusing {len(matched_bills) - len(changed_bills)} unchanged bills from {OUTPUT_FILE}")
+        
+        # Fetch all changed bill pages concurrently over HTTP
+        with ThreadPoolExecutor(max_workers=DETAIL_WORKERS) as executor:
+            http_details = list(executor.map(
+                extract_bill_details_http, [bill_data['bill_detail_url'] for bill_data in changed_bills]
+            ))
         
-        for i, bill_data in enumerate(bill_data_list):
+        for i, (bill_data, details) in enumerate(zip(changed_bills, http_details)):
             try:
-                # Filter by keywords in bill title (exact phrase match, case-insensitive)
-                has_keyword, matched_keyword = contains_keyword(bill_data['bill_title'], keywords)
+                # Pages that need JS fall back to the browser tabs, one at a time on this session's driver
+                if details is None:
+                    details = extract_bill_details_selenium(driver, bill_data['bill_detail_url'])
+                summary, detailed_last_action = details
                 
-                if has_keyword:
-                    print(f"Found matching bill: {bill_data['bill_number']} - {matched_keyword} - {bill_data['bill_title'][:50]}...")
-                    
-                    # Extract detailed info from bill detail page using tabs
-                    summary, detailed_last_action = extract_bill_details_selenium(driver, bill_data['bill_detail_url'])
-                    
-                    # Use detailed last action if available, otherwise use governor's action
-                    final_last_action = detailed_last_action if detailed_last_action else bill_data['gov_action']
-                    
-                    bill_record = {
-                        "Year": year,
-                        "State": STATE,
-                        "Bill Number": bill_data['bill_number'],
-                        "Bill Title/Topic": bill_data['bill_title'],
-                        "Summary": summary,
-                        "Sponsors": bill_data['sponsors'],
-                        "Last Action": final_last_action,
-                        "Bill Link": bill_data['bill_detail_url'],
-                        "Extracted Date": datetime.today().strftime("%Y-%m-%d"),
-                    }
-                    
-                    all_bills.append(bill_record)
-                    bills_found_matching_keywords += 1
-                    
-                    # Be polite to the server
-                    time.sleep(1)
+                # Use detailed last action if available, otherwise use governor's action
+                final_last_action = detailed_last_action if detailed_last_action else bill_data['gov_action']
+                
+                bill_record = {
+                    "Year": year,
+                    "State": STATE,
+                    "Bill Number": bill_data['bill_number'],
+                    "Bill Title/Topic": bill_data['bill_title'],
+                    "Summary": summary,
+                    "Sponsors": bill_data['sponsors'],
+                    "Last Action": final_last_action,
+                    "Bill Link": bill_data['bill_detail_url'],
+                    "Extracted Date": datetime.today().strftime("%Y-%m-%d"),
+                }
+                
+                all_bills.append(bill_record)
+                bills_found_matching_keywords += 1
+                
+                # Only a complete extraction is reused on later runs - a degraded record (no status,
+                # no summary) is written this run but refetched next time
+                key = f"{year}|{bill_data['bill_number']}"
+                if detailed_last_action and summary not in ("", "Summary not available"):
+                    listing_state[key] = listing_fingerprint(bill_data)
+                else:
+                    listing_state.pop(key, None)
                 
                 # Progress indicator
-                if (i + 1) % 100 == 0:
-                    print(f"Processed {i + 1}/{len(bill_data_list)} bills...")
+                if (i + 1) % 10 == 0:
+                    print(f"Processed {i + 1}/{len(changed_bills)} changed bills...")
                     
             except Exception as e:
-                print(f"Error processing bill {i}: {e}")
+                print(f"Error processing bill {bill_data['bill_number']}: {e}")
                 continue
         
         print(f"Year {year}: Found {bills_found_matching_keywords} bills matching keywords")
@@ -308,9 +459,6 @@ def scrape_bills_for_year_selenium(year, keywords):
     except Exception as e:
         print(f"Error scraping bills for year {year}: {e}")
         return []
-    finally:
-        # Always close the driver for this session
-        driver.quit()
 
 def load_existing_data(filepath):
     """Load existing Excel data if it exists"""
@@ -326,36 +474,35 @@ def save_data(existing_df, new_bills, filepath):
     if not new_bills:
         print("No new bills to save")
         return
-        
-    new_df = pd.DataFrame(new_bills)
     
-    if existing_df.empty:
-        combined_df = new_df
-    else:
-        # Combine and remove duplicates
-        combined_df = pd.concat([existing_df, new_df], ignore_index=True)
-        combined_df.drop_duplicates(subset=['Year', 'Bill Number'], keep='last', inplace=True)
-    
-    # Sort by Year and Bill Number
-    combined_df.sort_values(by=['Year', 'Bill Number'], inplace=True)
-    
-    # Save to Excel
-    combined_df.to_excel(filepath, index=False)
-    print(f"Saved {len(combined_df)} total bills to {filepath}")
+    total = save_bills_xlsx(existing_df, new_bills, filepath)
+    print(f"Saved {total} total bills to {filepath}")
 
 def main():
     all_scraped_bills = []
     
-    for year in SESSIONS:
-        bills = scrape_bills_for_year_selenium(year, KEYWORDS)
-        print(f"Session {year}: Found {len(bills)} bills matching keywords")
-        all_scraped_bills.extend(bills)
+    # Load existing data first so unchanged bills can skip their detail pages
+    existing_df = load_existing_data(OUTPUT_FILE)
+    previous_records = {bill_key(record): record for record in existing_df.fillna('').to_dict('records')}
+    listing_state = load_listing_state()
+    
+    # One WebDriver shared by every session
+    driver = webdriver.Chrome(options=chrome_options)
+    block_heavy_resources(driver)
+    try:
+        for year in SESSIONS:
+            bills = scrape_bills_for_year_selenium(driver, year, previous_records, listing_state)
+            print(f"Session {year}: Found {len(bills)} bills matching keywords")
+            all_scraped_bills.extend(bills)
+    finally:
+        # Always close the driver
+        driver.quit()
     
     print(f"Total bills scraped across all sessions: {len(all_scraped_bills)}")
     
-    # Load existing data and save
-    existing_df = load_existing_data(OUTPUT_FILE)
+    # Save merged data, then the fingerprints it now reflects
     save_data(existing_df, all_scraped_bills, OUTPUT_FILE)
+    save_listing_state(listing_state)
 
 if __name__ == "__main__":
     main()
@@ -1,15 +1,23 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+import lxml.html
+from lxml import etree
 import pandas as pd
 from datetime import datetime
 import os
 import re
-import time
+import json
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from scraper_common import save_bills_xlsx
 
 # Configuration
 STATE = "West Virginia"
 SESSIONS = ["2025", "2026"]
 OUTPUT_FILE = "West_Virginia_Bills_Filtered.xlsx"
+DETAIL_CACHE_FILE = ".wv_detail_cache.json"  # Parsed bill-status details from previous runs
+DETAIL_WORKERS = 8  # Concurrent bill-status page fetches (also the politeness cap on requests in flight)
 
 # Keywords for filtering (exact phrase, case-insensitive) in Title
 KEYWORDS = [
@@ -32,30 +40,51 @@ HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/103.0.0.0 Safari/537.36"
 }
 
+# One pooled keep-alive session for every wvlegislature.gov request
+http_session = requests.Session()
+http_session.headers.update(HEADERS)
+http_session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=32))
+
+# Keyword matching - one alternation (longest phrase first) scans a title for all keywords in a single pass
+_WS_RE = re.compile(r'\s+')
+_KW_RE = re.compile('|'.join(re.escape(k.lower()) for k in sorted(KEYWORDS, key=len, reverse=True)))
+
+# Bill row / URL parsing
+_BILL_RE = re.compile(r'^[SH]B\s+\d+')
+_NUM_RE = re.compile(r'\d+')
+
+@functools.lru_cache(maxsize=4096)
 def normalize_text(text):
-    """Normalize text for keyword matching"""
+    """Normalize text for keyword matching (memoized - titles repeat across sessions)"""
     if not text:
         return ""
-    return re.sub(r'\s+', ' ', text).strip().lower()
+    return _WS_RE.sub(' ', text).strip().lower()
 
-def contains_keyword(text, keywords):
+def contains_keyword(text):
     """Check if text contains any of the keywords as exact phrases (case-insensitive)"""
-    text_norm = normalize_text(text)
-    for keyword in keywords:
-        if keyword.lower() in text_norm:
-            return True, keyword
-    return False, None
+    m = _KW_RE.search(normalize_text(text))
+    return (True, m.group()) if m else (False, None)
+
+# First <table> (in document order) holding a row with 2+ cells whose first cell reads like "SB 12" / "HB 3187"
+BILL_TABLE_XPATH = etree.XPath(
+    '//table[.//tr[count(.//td) >= 2 and re:test(normalize-space((.//td)[1]), "^[SH]B\\s+\\d+")]]',
+    namespaces={'re': 'http://exslt.org/regular-expressions'},
+)
+
+def element_text(elem, separator=''):
+    """Stripped text of an lxml element's strings joined by separator (BeautifulSoup get_text(strip=True) semantics)"""
+    return separator.join(part for part in (text.strip() for text in elem.itertext()) if part)
 
 def extract_bill_details(bill_url):
     """Visit individual bill page and extract summary, sponsors, and detailed last action"""
     try:
-        response = requests.get(bill_url, headers=HEADERS)
+        response = http_session.get(bill_url)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        tree = lxml.html.fromstring(response.content)
         
         # Find table with class 'bstat'
-        bstat_table = soup.find('table', class_='bstat')
-        if not bstat_table:
+        bstat_tables = tree.xpath('//table[contains(concat(" ", normalize-space(@class), " "), " bstat ")]')
+        if not bstat_tables:
             return "", "", ""
         
         summary = ""
@@ -63,21 +92,21 @@ def extract_bill_details(bill_url):
         last_action = ""
         
         # Extract data from table rows
-        rows = bstat_table.find_all('tr')
+        rows = bstat_tables[0].xpath('.//tr')
         for row in rows:
-            cells = row.find_all('td')
+            cells = row.xpath('.//td')
             if len(cells) >= 2:
                 header_cell = cells[0]
                 data_cell = cells[1]
                 
-                header_text = header_cell.get_text(strip=True).upper()
+                header_text = element_text(header_cell).upper()
                 
                 if "SUMMARY:" in header_text:
-                    summary = data_cell.get_text(separator=' ', strip=True)
+                    summary = element_text(data_cell, ' ')
                 elif "LEAD SPONSOR:" in header_text:
-                    sponsors = data_cell.get_text(separator=' ', strip=True)
+                    sponsors = element_text(data_cell, ' ')
                 elif "LAST ACTION:" in header_text:
-                    last_action = data_cell.get_text(separator=' ', strip=True)
+                    last_action = element_text(data_cell, ' ')
         
         return summary, sponsors, last_action
         
@@ -85,10 +114,23 @@ def extract_bill_details(bill_url):
         print(f"Error fetching details from {bill_url}: {e}")
         return "", "", ""
 
+def load_detail_cache(filepath=DETAIL_CACHE_FILE):
+    """Load cached bill details: "year|bill number" -> {'last_action_basic': ..., 'details': [summary, sponsors, last_action]}"""
+    try:
+        with open(filepath, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_detail_cache(detail_cache, filepath=DETAIL_CACHE_FILE):
+    """Persist cached bill details for the next run"""
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(detail_cache, f)
+
 def build_bill_detail_url(bill_number, year):
     """Build the URL for individual bill details"""
     # Extract the numeric part from bill number (e.g., "SB 1" -> "1", "HB 3187" -> "3187")
-    bill_num = re.search(r'\d+', bill_number)
+    bill_num = _NUM_RE.search(bill_number)
     if bill_num:
         input_num = bill_num.group()
         return f"https://www.wvlegislature.gov/Bill_Status/Bills_history.cfm?input={input_num}&year={year}&sessiontype=RS&btype=bill"
@@ -96,59 +138,70 @@ def build_bill_detail_url(bill_number, year):
         print(f"Warning: Could not extract number from bill: {bill_number}")
         return ""
 
-def parse_bill_row(row):
-    """Parse a bill row handling both 4-column and 6-column structures"""
-    cells = row.find_all('td')
+def parse_bill_key(row):
+    """Parse just the bill number and title of a bill row (an lxml <tr>).
+    
+    Returns (bill_number, bill_title, cells), or None for header/non-bill rows.
+    """
+    cells = row.xpath('.//td')
     
     if len(cells) < 4:
         return None
     
     # Extract bill number and link from first cell
     bill_number_cell = cells[0]
-    bill_link_tag = bill_number_cell.find('a')
-    if not bill_link_tag:
+    bill_link_tags = bill_number_cell.xpath('.//a')
+    if not bill_link_tags:
         return None
     
-    bill_number = bill_link_tag.text.strip()
+    bill_number = bill_link_tags[0].text_content().strip()
     
     # Skip header rows
-    if not re.match(r'^[SH]B\s+\d+', bill_number):
+    if not _BILL_RE.match(bill_number):
         return None
     
     # Extract title from second cell
-    bill_title = cells[1].text.strip()
+    bill_title = cells[1].text_content().strip()
     
-    # Handle different row structures
+    return bill_number, bill_title, cells
+
+def parse_bill_rest(cells):
+    """Parse the remaining columns of a bill row, handling both 4-column and 6-column structures"""
     if len(cells) >= 6:
         # Standard 6-column structure: Number, Title, Status, Committee, Step, Last Action
-        status = cells[2].text.strip()
-        committee = cells[3].text.strip()
-        step = cells[4].text.strip()
-        last_action_basic = cells[5].text.strip()
+        status = cells[2].text_content().strip()
+        committee = cells[3].text_content().strip()
+        step = cells[4].text_content().strip()
+        last_action_basic = cells[5].text_content().strip()
     elif len(cells) == 4:
         # Compact 4-column structure: Number, Title, Status, Last Action (with colspan=3)
-        status = cells[2].text.strip()
+        status = cells[2].text_content().strip()
         committee = ""  # Not available in compact structure
         step = ""       # Not available in compact structure
-        last_action_basic = cells[3].text.strip()
+        last_action_basic = cells[3].text_content().strip()
     else:
         # Handle other structures if needed
-        status = cells[2].text.strip() if len(cells) > 2 else ""
+        status = cells[2].text_content().strip() if len(cells) > 2 else ""
         committee = ""
         step = ""
-        last_action_basic = cells[3].text.strip() if len(cells) > 3 else ""
+        last_action_basic = cells[3].text_content().strip() if len(cells) > 3 else ""
     
     return {
-        'bill_number': bill_number,
-        'bill_title': bill_title,
         'status': status,
         'committee': committee,
         'step': step,
         'last_action_basic': last_action_basic
     }
 
-def scrape_bills_for_year(year, keywords):
-    """Scrape all bills for a given year from West Virginia legislature"""
+def scrape_bills_for_year(year, detail_cache=None, detail_executor=None):
+    """Scrape all bills for a given year from West Virginia legislature.
+    
+    Bill details are reused from detail_cache while the listing's last action is
+    unchanged; fresh fetches are written back into it. Detail pages are fetched on
+    detail_executor when given (so concurrent sessions share one DETAIL_WORKERS cap),
+    otherwise on a pool of this call's own.
+    """
+    detail_cache = detail_cache if detail_cache is not None else {}
     print(f"Scraping West Virginia bills for session {year}...")
     
     base_url = f"https://www.wvlegislature.gov/Bill_Status/Bills_all_bills.cfm"
@@ -159,80 +212,44 @@ def scrape_bills_for_year(year, keywords):
     }
     
     try:
-        response = requests.get(base_url, params=params, headers=HEADERS)
+        response = http_session.get(base_url, params=params)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        tree = lxml.html.fromstring(response.content)
         
-        # Find ALL tables on the page
-        tables = soup.find_all('table')
-        print(f"Found {len(tables)} tables on the page")
-        
-        # Look for the table containing bill data
-        bill_table = None
-        for table in tables:
-            rows = table.find_all('tr')
-            for row in rows:
-                cells = row.find_all('td')
-                if cells and len(cells) >= 2:
-                    first_cell_text = cells[0].get_text(strip=True)
-                    if re.match(r'^[SH]B\s+\d+', first_cell_text):
-                        bill_table = table
-                        break
-            if bill_table:
-                break
-        
-        if not bill_table:
+        # Locate the bill table directly - the first table with a row whose first cell is a bill number
+        bill_tables = BILL_TABLE_XPATH(tree)
+        if not bill_tables:
             print(f"No table with bill data found for year {year}")
             return []
-        
-        print(f"Found bill table with {len(bill_table.find_all('tr'))} rows")
+        bill_table = bill_tables[0]
         
         # Process bill rows
-        rows = bill_table.find_all('tr')
-        all_bills = []
-        bills_found_matching_keywords = 0
+        rows = bill_table.xpath('.//tr')
+        print(f"Found bill table with {len(rows)} rows")
         
+        # First pass: parse rows and collect matching bills with their detail URLs
+        matched_bills = []
         for i, row in enumerate(rows):
             try:
-                # Parse the row using the flexible parser
-                bill_info = parse_bill_row(row)
+                # Parse only the number and title - most rows are rejected by the keyword filter
+                bill_key = parse_bill_key(row)
                 
-                if not bill_info:
+                if not bill_key:
                     continue
+                bill_number, bill_title, cells = bill_key
                 
                 # Filter by keywords in bill title (exact phrase match, case-insensitive)
-                has_keyword, matched_keyword = contains_keyword(bill_info['bill_title'], keywords)
+                has_keyword, matched_keyword = contains_keyword(bill_title)
                 
                 if has_keyword:
+                    bill_info = {'bill_number': bill_number, 'bill_title': bill_title, **parse_bill_rest(cells)}
                     print(f"Found matching bill: {bill_info['bill_number']} - {matched_keyword} - {bill_info['bill_title'][:50]}...")
                     
                     # Build URL for bill details
                     bill_detail_url = build_bill_detail_url(bill_info['bill_number'], year)
                     
                     if bill_detail_url:  # Only proceed if URL was built successfully
-                        # Extract detailed info from bill detail page
-                        summary, sponsors, detailed_last_action = extract_bill_details(bill_detail_url)
-                        
-                        # Use detailed last action if available, otherwise use basic one
-                        final_last_action = detailed_last_action if detailed_last_action else bill_info['last_action_basic']
-                        
-                        bill_data = {
-                            "Year": year,
-                            "State": STATE,
-                            "Bill Number": bill_info['bill_number'],
-                            "Bill Title/Topic": bill_info['bill_title'],
-                            "Summary": summary,
-                            "Sponsors": sponsors,
-                            "Last Action": final_last_action,
-                            "Bill Link": bill_detail_url,
-                            "Extracted Date": datetime.today().strftime("%Y-%m-%d"),
-                        }
-                        
-                        all_bills.append(bill_data)
-                        bills_found_matching_keywords += 1
-                        
-                        # Be polite to the server
-                        time.sleep(0.5)
+                        matched_bills.append((bill_info, bill_detail_url))
                     else:
                         print(f"Skipping {bill_info['bill_number']} due to URL build failure")
                 
@@ -244,6 +261,53 @@ def scrape_bills_for_year(year, keywords):
                 print(f"Error processing row {i}: {e}")
                 continue
         
+        # Bills whose listing last action hasn't moved since the cached fetch skip their detail page
+        details = {}
+        to_fetch = []
+        for bill_info, bill_detail_url in matched_bills:
+            cached = detail_cache.get(f"{year}|{bill_info['bill_number']}")
+            if cached and cached['last_action_basic'] == bill_info['last_action_basic']:
+                details[bill_info['bill_number']] = tuple(cached['details'])
+            else:
+                to_fetch.append((bill_info, bill_detail_url))
+        if details:
+            print(f"Reusing cached details for {len(details)} unchanged bills")
+        
+        # Second pass: fetch detail pages concurrently; the pool size caps requests in flight
+        with nullcontext(detail_executor) if detail_executor else ThreadPoolExecutor(max_workers=DETAIL_WORKERS) as executor:
+            fetched = executor.map(extract_bill_details, [url for _, url in to_fetch])
+            for (bill_info, _), bill_details in zip(to_fetch, fetched):
+                details[bill_info['bill_number']] = bill_details
+                if any(bill_details):  # Don't cache failed fetches
+                    detail_cache[f"{year}|{bill_info['bill_number']}"] = {
+                        'last_action_basic': bill_info['last_action_basic'],
+                        'details': list(bill_details),
+                    }
+        
+        all_bills = []
+        bills_found_matching_keywords = 0
+        
+        for bill_info, bill_detail_url in matched_bills:
+            summary, sponsors, detailed_last_action = details[bill_info['bill_number']]
+            
+            # Use detailed last action if available, otherwise use basic one
+            final_last_action = detailed_last_action if detailed_last_action else bill_info['last_action_basic']
+            
+            bill_data = {
+                "Year": year,
+                "State": STATE,
+                "Bill Number": bill_info['bill_number'],
+                "Bill Title/Topic": bill_info['bill_title'],
+                "Summary": summary,
+                "Sponsors": sponsors,
+                "Last Action": final_last_action,
+                "Bill Link": bill_detail_url,
+                "Extracted Date": datetime.today().strftime("%Y-%m-%d"),
+            }
+            
+            all_bills.append(bill_data)
+            bills_found_matching_keywords += 1
+        
         print(f"Year {year}: Found {bills_found_matching_keywords} bills matching keywords")
         return all_bills
         
@@ -265,30 +329,26 @@ def save_data(existing_df, new_bills, filepath):
     if not new_bills:
         print("No new bills to save")
         return
-        
-    new_df = pd.DataFrame(new_bills)
-    
-    if existing_df.empty:
-        combined_df = new_df
-    else:
-        # Combine and remove duplicates
-        combined_df = pd.concat([existing_df, new_df], ignore_index=True)
-        combined_df.drop_duplicates(subset=['Year', 'Bill Number'], keep='last', inplace=True)
     
-    # Sort by Year and Bill Number
-    combined_df.sort_values(by=['Year', 'Bill Number'], inplace=True)
-    
-    # Save to Excel
-    combined_df.to_excel(filepath, index=False)
-    print(f"Saved {len(combined_df)} total bills to {filepath}")
+    total = save_bills_xlsx(existing_df, new_bills, filepath)
+    print(f"Saved {total} total bills to {filepath}")
 
 def main():
     all_scraped_bills = []
     
-    for year in SESSIONS:
-        bills = scrape_bills_for_year(year, KEYWORDS)
-        print(f"Session {year}: Found {len(bills)} bills matching keywords")
-        all_scraped_bills.extend(bills)
+    detail_cache = load_detail_cache()
+    
+    # Sessions are independent listings - scrape them concurrently over the shared session.
+    # Each year writes only its own "year|bill number" cache keys, and all years queue their
+    # detail pages on one pool so DETAIL_WORKERS stays the cap on requests in flight.
+    with ThreadPoolExecutor(max_workers=DETAIL_WORKERS) as detail_executor, \
+            ThreadPoolExecutor(max_workers=len(SESSIONS)) as executor:
+        results = executor.map(lambda year: scrape_bills_for_year(year, detail_cache, detail_executor), SESSIONS)
+        for year, bills in zip(SESSIONS, results):
+            print(f"Session {year}: Found {len(bills)} bills matching keywords")
+            all_scraped_bills.extend(bills)
+    
+    save_detail_cache(detail_cache)
     
     print(f"Total bills scraped across all sessions: {len(all_scraped_bills)}")
     
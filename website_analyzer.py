@@ -1,6 +1,5 @@
 import requests
-from bs4 import BeautifulSoup
-import time
+import lxml.html
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -8,11 +7,76 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+}
+
+# Serializes every form control in the page in a single WebDriver command
+FORM_CONTROLS_JS = """
+return Array.from(document.querySelectorAll('input,select,button')).map(e => ({
+    tag: e.tagName.toLowerCase(),
+    type: e.type,
+    name: e.name,
+    id: e.id,
+    placeholder: e.placeholder,
+    value: e.value,
+    text: e.innerText,
+    options: Array.from(e.options || []).map(o => o.text),
+    element: e
+}));
+"""
+
+# Length of the rendered page and non-overlapping occurrence counts of each (lowercase) indicator
+PAGE_INDICATOR_COUNTS_JS = """
+const source = document.documentElement.outerHTML.toLowerCase();
+const counts = {};
+for (const indicator of arguments[0]) {
+    counts[indicator] = source.split(indicator).length - 1;
+}
+return {length: source.length, counts: counts};
+"""
+
+def lxml_control(elem):
+    """Same record as FORM_CONTROLS_JS, built from an lxml element"""
+    tag = elem.tag.lower()
+    return {
+        'tag': tag,
+        'type': elem.get('type', 'submit' if tag == 'button' else 'text' if tag == 'input' else None),
+        'name': elem.get('name'),
+        'id': elem.get('id'),
+        'placeholder': elem.get('placeholder'),
+        'value': elem.get('value'),
+        'text': elem.text_content().strip(),
+        'options': [opt.text_content().strip() for opt in elem.xpath('.//option')],
+        'element': elem
+    }
+
+def _text(elem):
+    """Visible text of a Selenium WebElement or an lxml element"""
+    return elem.text if hasattr(elem, 'get_attribute') else elem.text_content().strip()
+
 class LouisianaLegislatureAnalyzer:
     def __init__(self):
         self.base_url = "https://www.legis.la.gov"
         self.search_url = "https://www.legis.la.gov/Legis/BillSearch.aspx"
-        self.setup_driver()
+        self.driver = None  # Started on first use - read-only probes try plain HTTP first
+    
+    @property
+    def browser(self):
+        """The WebDriver, launched the first time something needs a real browser"""
+        if self.driver is None:
+            self.setup_driver()
+        return self.driver
+    
+    def fetch_static_page(self):
+        """Fetch the search page over HTTP and parse it with lxml; None if that fails"""
+        try:
+            response = requests.get(f"{self.search_url}?sid=current", headers=HEADERS, timeout=30)
+            response.raise_for_status()
+            return lxml.html.fromstring(response.content)
+        except Exception as e:
+            print(f"⚠️  HTTP fetch failed, falling back to browser: {str(e)}")
+            return None
     
     def setup_driver(self):
         """Setup Chrome WebDriver with Selenium Manager (automatic driver management)"""
@@ -37,19 +101,26 @@ class LouisianaLegislatureAnalyzer:
         print("🔍 Analyzing Louisiana Legislature Search Page...")
         
         try:
-            # Navigate to the search page
-            self.driver.get(f"{self.search_url}?sid=current")
-            time.sleep(3)
+            # The form is server-rendered, so read it over plain HTTP when possible
+            root = self.fetch_static_page()
+            if root is not None and not root.xpath('//input'):
+                print("⚠️  No form inputs in the static HTML, falling back to browser")
+                root = None
             
-            # Get page title
-            page_title = self.driver.title
+            if root is not None:
+                page_title = (root.findtext('.//title') or '').strip()
+            else:
+                # Navigate to the search page
+                self.browser.get(f"{self.search_url}?sid=current")
+                WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "input")))
+                page_title = self.driver.title
             print(f"📄 Page Title: {page_title}")
             
             # Find search form elements
-            search_elements = self.find_search_elements()
+            search_elements = self.find_search_elements(root)
             
             # Check available sessions
-            sessions = self.find_available_sessions()
+            sessions = self.find_available_sessions(root)
             
             return {
                 'page_title': page_title,
@@ -61,20 +132,25 @@ class LouisianaLegislatureAnalyzer:
             print(f"❌ Error analyzing search page: {str(e)}")
             return None
     
-    def find_search_elements(self):
-        """Find and analyze search form elements"""
+    def find_search_elements(self, root=None):
+        """Find and analyze search form elements, in a parsed lxml page if given, else in the browser"""
         elements = {}
         
         try:
-            # Look for search input fields
-            search_inputs = self.driver.find_elements(By.TAG_NAME, "input")
+            # Snapshot every form control in one pass - one JS round-trip instead of one per attribute
+            if root is not None:
+                controls = [lxml_control(elem) for elem in root.xpath('//input | //select | //button')]
+            else:
+                controls = self.browser.execute_script(FORM_CONTROLS_JS)
+            
+            search_inputs = [c for c in controls if c['tag'] == 'input']
             print(f"🔎 Found {len(search_inputs)} input elements")
             
-            for idx, input_elem in enumerate(search_inputs):
-                input_type = input_elem.get_attribute("type")
-                input_name = input_elem.get_attribute("name")
-                input_id = input_elem.get_attribute("id")
-                input_placeholder = input_elem.get_attribute("placeholder")
+            for idx, control in enumerate(search_inputs):
+                input_type = control['type']
+                input_name = control['name']
+                input_id = control['id']
+                input_placeholder = control['placeholder']
                 
                 print(f"  Input {idx}: type='{input_type}', name='{input_name}', id='{input_id}', placeholder='{input_placeholder}'")
                 
@@ -82,17 +158,17 @@ class LouisianaLegislatureAnalyzer:
                     elements['summary_search'] = {
                         'name': input_name,
                         'id': input_id,
-                        'element': input_elem
+                        'element': control['element']
                     }
             
             # Look for dropdown/select elements (for session selection)
-            dropdowns = self.driver.find_elements(By.TAG_NAME, "select")
+            dropdowns = [c for c in controls if c['tag'] == 'select']
             print(f"📋 Found {len(dropdowns)} dropdown elements")
             
-            for idx, select_elem in enumerate(dropdowns):
-                select_name = select_elem.get_attribute("name")
-                select_id = select_elem.get_attribute("id")
-                options = select_elem.find_elements(By.TAG_NAME, "option")
+            for idx, control in enumerate(dropdowns):
+                select_name = control['name']
+                select_id = control['id']
+                options = control['options']
                 
                 print(f"  Dropdown {idx}: name='{select_name}', id='{select_id}', options={len(options)}")
                 
@@ -100,25 +176,24 @@ class LouisianaLegislatureAnalyzer:
                     elements['session_dropdown'] = {
                         'name': select_name,
                         'id': select_id,
-                        'element': select_elem,
-                        'options': [opt.text for opt in options]
+                        'element': control['element'],
+                        'options': options
                     }
             
             # Look for submit buttons
-            buttons = self.driver.find_elements(By.TAG_NAME, "input")
-            buttons.extend(self.driver.find_elements(By.TAG_NAME, "button"))
+            buttons = search_inputs + [c for c in controls if c['tag'] == 'button']
             
-            for button in buttons:
-                button_type = button.get_attribute("type")
-                button_value = button.get_attribute("value")
-                button_text = button.text
+            for control in buttons:
+                button_type = control['type']
+                button_value = control['value']
+                button_text = control['text']
                 
                 if button_type == "submit" or "search" in str(button_value).lower():
                     elements['search_button'] = {
                         'type': button_type,
                         'value': button_value,
                         'text': button_text,
-                        'element': button
+                        'element': control['element']
                     }
                     print(f"🔘 Search Button: type='{button_type}', value='{button_value}', text='{button_text}'")
             
@@ -128,16 +203,20 @@ class LouisianaLegislatureAnalyzer:
             print(f"❌ Error finding search elements: {str(e)}")
             return {}
     
-    def find_available_sessions(self):
-        """Find available legislative sessions"""
+    def find_available_sessions(self, root=None):
+        """Find available legislative sessions, in a parsed lxml page if given, else in the browser"""
         sessions = []
         
         try:
             # Look for session information in the page
-            session_elements = self.driver.find_elements(By.XPATH, "//*[contains(text(), '2025') or contains(text(), '2026')]")
+            session_xpath = "//*[contains(text(), '2025') or contains(text(), '2026')]"
+            if root is not None:
+                session_elements = root.xpath(session_xpath)
+            else:
+                session_elements = self.browser.find_elements(By.XPATH, session_xpath)
             
             for elem in session_elements:
-                text = elem.text.strip()
+                text = _text(elem).strip()
                 if "2025" in text or "2026" in text:
                     sessions.append(text)
             
@@ -156,9 +235,9 @@ class LouisianaLegislatureAnalyzer:
         print(f"🧪 Testing search functionality with keyword: '{test_keyword}'")
         
         try:
-            # Navigate to search page
-            self.driver.get(f"{self.search_url}?sid=current")
-            time.sleep(3)
+            # Navigate to search page (typing and clicking needs the real browser)
+            self.browser.get(f"{self.search_url}?sid=current")
+            WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "input")))
             
             # Find and fill search input
             search_elements = self.find_search_elements()
@@ -171,10 +250,14 @@ class LouisianaLegislatureAnalyzer:
                 # Click search button
                 if 'search_button' in search_elements:
                     search_button = search_elements['search_button']['element']
+                    start_url = self.driver.current_url
                     search_button.click()
                     
-                    # Wait for results
-                    time.sleep(5)
+                    # Wait for results - a new URL, or the old form going stale after an ASP.NET postback
+                    WebDriverWait(self.driver, 10).until(EC.any_of(
+                        EC.url_changes(start_url),
+                        EC.staleness_of(search_button)
+                    ))
                     
                     # Check for results
                     current_url = self.driver.current_url
@@ -211,7 +294,7 @@ class LouisianaLegislatureAnalyzer:
             ]
             
             for pattern in result_patterns:
-                elements = self.driver.find_elements(By.XPATH, pattern)
+                elements = self.browser.find_elements(By.XPATH, pattern)
                 if elements:
                     print(f"📋 Found {len(elements)} elements matching pattern: {pattern}")
                     
@@ -229,27 +312,23 @@ class LouisianaLegislatureAnalyzer:
             print(f"❌ Error finding search results: {str(e)}")
             return False
     
-    def get_page_source_sample(self):
-        """Get a sample of the current page source for debugging"""
+    def print_page_indicators(self):
+        """Print the current page's length and how often key indicators appear, for debugging"""
         try:
-            source = self.driver.page_source
-            print(f"📄 Page source length: {len(source)} characters")
-            
-            # Look for key indicators
+            # Count key indicators in the browser - only the counts cross the WebDriver connection
             indicators = ['bill', 'search', 'result', 'HB', 'SB', '2025']
-            for indicator in indicators:
-                count = source.lower().count(indicator.lower())
-                print(f"  '{indicator}' appears {count} times")
+            counts = self.browser.execute_script(PAGE_INDICATOR_COUNTS_JS, [i.lower() for i in indicators])
+            print(f"📄 Page source length: {counts['length']} characters")
             
-            return source
+            for indicator in indicators:
+                print(f"  '{indicator}' appears {counts['counts'][indicator.lower()]} times")
             
         except Exception as e:
-            print(f"❌ Error getting page source: {str(e)}")
-            return None
+            print(f"❌ Error counting page indicators: {str(e)}")
     
     def close(self):
         """Close the webdriver"""
-        if hasattr(self, 'driver'):
+        if self.driver is not None:
             self.driver.quit()
 
 # Test script
@@ -290,7 +369,7 @@ if __name__ == "__main__":
             print("\n" + "="*50)
             print("🔍 PAGE SOURCE ANALYSIS")
             print("="*50)
-            analyzer.get_page_source_sample()
+            analyzer.print_page_indicators()
             
         else:
             print("❌ Search functionality test FAILED")